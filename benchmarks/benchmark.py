@@ -0,0 +1,280 @@
+import os
+import sys
+import argparse
+import json
+import time
+import random
+import platform
+import datetime
+import tracemalloc
+import contextlib
+
+# Headless: no window is opened and no audio device is needed
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LAUNCH_DIR = os.getcwd() # --output and --compare paths are relative to where the script was started
+sys.path.insert(0, REPO_ROOT)
+os.chdir(REPO_ROOT) # Assets and fonts are loaded relative to the repository
+
+import pygame
+import maze
+
+SIZES = [24, 100, 500, 1000, 2000] # Square grids, in cells per side
+QUICK_SIZES = [24, 100]
+SEED = 1234 # Every run carves the same mazes
+MONSTER_STEPS = 2000 # Monster.update calls per measurement
+GAME_FRAMES = 60 # Game frames per measurement
+GAME_TICKS = 240 # Simulation ticks per game_tick measurement
+KEY_INTERVAL = 4 # Frames between the simulated player's key presses, about 15 moves a second at 60 FPS
+
+# Each benchmark takes a prepared context and returns (work units done, unit name); only this call is timed.
+# Setup that the benchmark does not measure (carving the maze it solves, for instance) happens in prepare().
+
+class Context():
+    # Everything a benchmark needs for one grid size, built once and shared so only the measured step is repeated
+    def __init__(self, size):
+        self.size = size
+        self.screen = pygame.display.set_mode(maze.SCREEN_SIZE)
+        self.walls = maze.generate_maze(size, size, SEED)
+        self.start = (0, 0)
+        self.finish = (size - 1, size - 1)
+
+    def new_maze(self):
+        return maze.Maze(self.screen, *self.start, *self.finish, num_rows=self.size, num_cols=self.size)
+
+    def carved_maze(self):
+        maze_obj = self.new_maze()
+        maze_obj.load_walls(self.walls)
+        return maze_obj
+
+    def camera(self):
+        camera = maze.Camera(maze.WIDTH, maze.HEIGHT, self.size, self.size)
+        camera.follow(*self.start)
+        return camera
+
+def bench_maze_init(context):
+    context.new_maze()
+    return context.size * context.size, "cells"
+
+def bench_maze_dfs(context):
+    context.new_maze().dfs(seed=SEED)
+    return context.size * context.size, "cells"
+
+def prepare_maze_bfs(context):
+    context.bfs_maze = context.carved_maze()
+    context.bfs_player = maze.Player(*context.start, num_rows=context.size, num_cols=context.size)
+
+def bench_maze_bfs(context):
+    # frame_budget=0: the search and path marking without the replay animation
+    context.bfs_maze.bfs(context.screen, context.bfs_player, frame_budget=0)
+    return context.bfs_maze.last_solve[1], "cells expanded"
+
+def prepare_maze_render(context):
+    context.render_maze = context.carved_maze()
+    context.render_camera = context.camera()
+
+def bench_maze_render(context):
+    # What the game repaints: the cells inside the viewport
+    context.render_maze.render(context.screen, context.render_camera)
+    first_row, last_row, first_col, last_col = context.render_camera.visible_cells()
+    return (last_row - first_row) * (last_col - first_col), "cells"
+
+def prepare_monster_update(context):
+    context.monster_maze = context.carved_maze()
+    context.monster_player = maze.Player(*context.start, num_rows=context.size, num_cols=context.size)
+    source = context.monster_maze.cell_index(*context.start)
+    context.monster_field = maze.distance_field(context.walls, context.size, context.size, source)
+
+def bench_monster_update(context):
+    # A monster walking towards the player from the far corner along the shared distance field
+    monster = maze.Monster(*context.finish, image_path="assets/monster_1.png", move_delay=1, num_rows=context.size, num_cols=context.size)
+    for _ in range(MONSTER_STEPS):
+        monster.update(context.monster_player, context.monster_maze, context.monster_field)
+    return MONSTER_STEPS, "updates"
+
+STEP_KEYS = {1: pygame.K_RIGHT, -1: pygame.K_LEFT}
+
+def prepare_game_frame(context):
+    # The player walks the solution path one key press every KEY_INTERVAL frames, so the camera scrolls and the
+    # chase field is recomputed the way it is in play
+    game = maze.Game(num_rows=context.size, num_cols=context.size, pregenerate=0)
+    context.game_layout = maze.place_layout(context.walls, context.size, context.size, rng=random.Random(SEED))
+    game.setup_new_game(context.game_layout)
+    start = game.maze.cell_index(game.player.matrix_pos_x_row, game.player.matrix_pos_y_col)
+    goal = game.maze.cell_index(game.final_coordinate_x_row, game.final_coordinate_y_col)
+    path, _ = maze.solve_bfs(game.maze.walls, context.size, context.size, start, goal)
+    keys = [STEP_KEYS.get(step - index, pygame.K_DOWN if step > index else pygame.K_UP) for index, step in zip(path, path[1:])]
+    context.game_keys = [[pygame.event.Event(pygame.KEYDOWN, key=key)] for key in keys]
+    context.game_spawns = [(monster_obj.matrix_pos_x_row, monster_obj.matrix_pos_y_col) for monster_obj in game.monsters]
+    context.game_start = (game.player.matrix_pos_x_row, game.player.matrix_pos_y_col)
+    game.invalidate_display()
+    game.render_game_elements()
+    context.game = game
+
+def restart_game(context):
+    # Back to the start of the walk without rebuilding anything, when the player is caught or reaches the goal
+    game = context.game
+    game.player.matrix_pos_x_row, game.player.matrix_pos_y_col = context.game_start
+    game.player._recalculate_screen_pos()
+    for monster_obj, (row, col) in zip(game.monsters, context.game_spawns):
+        monster_obj.matrix_pos_x_row, monster_obj.matrix_pos_y_col = row, col
+        monster_obj._recalculate_screen_pos()
+    game.game_over = game.winner = False
+    game.simulation = maze.Simulation(context.game_layout, random.Random(SEED))
+    game.snap_sprites()
+
+def bench_game_frame(context):
+    # Steady-state frames: one simulation tick and a dirty-rect render each
+    game = context.game
+    step = 0
+    for frame in range(GAME_FRAMES):
+        if game.game_over or game.winner or step >= len(context.game_keys):
+            restart_game(context)
+            step = 0
+        events = []
+        if frame % KEY_INTERVAL == 0 and context.game_keys:
+            events = context.game_keys[step]
+            step += 1
+        game.update_game_state(events)
+        game.render_game_elements(0.5)
+    return GAME_FRAMES, "frames"
+
+def bench_game_tick(context):
+    # The same walk with no rendering, through Game.simulate: the simulation's share of a frame
+    game = context.game
+    step = ticks = 0
+    while ticks < GAME_TICKS:
+        if game.game_over or game.winner or step >= len(context.game_keys):
+            restart_game(context)
+            step = 0
+        ticks += game.simulate(KEY_INTERVAL, context.game_keys[step] if context.game_keys else ())
+        step += 1
+    return ticks, "ticks"
+
+BENCHMARKS = {
+    "maze_init": (None, bench_maze_init),
+    "maze_dfs": (None, bench_maze_dfs),
+    "maze_bfs": (prepare_maze_bfs, bench_maze_bfs),
+    "maze_render": (prepare_maze_render, bench_maze_render),
+    "monster_update": (prepare_monster_update, bench_monster_update),
+    "game_frame": (prepare_game_frame, bench_game_frame),
+    "game_tick": (prepare_game_frame, bench_game_tick),
+}
+
+def measure(name, context, repeat):
+    # Best and mean wall time over `repeat` runs, then one extra run under tracemalloc for the peak memory
+    prepare, bench = BENCHMARKS[name]
+    timings = []
+    with open(os.devnull, "w") as quiet, contextlib.redirect_stdout(quiet): # The game's "Game Over" prints
+        for _ in range(repeat):
+            if prepare: prepare(context)
+            started = time.perf_counter()
+            units, unit = bench(context)
+            timings.append(time.perf_counter() - started)
+        if prepare: prepare(context)
+        tracemalloc.start()
+        bench(context)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    best = min(timings)
+    return {
+        "benchmark": name,
+        "rows": context.size,
+        "cols": context.size,
+        "repeat": repeat,
+        "seconds_best": best,
+        "seconds_mean": sum(timings) / len(timings),
+        "units": units,
+        "unit": unit,
+        "throughput": units / best if best else float("inf"),
+        "peak_memory_bytes": peak_memory,
+    }
+
+def git_revision():
+    head = os.path.join(REPO_ROOT, ".git", "HEAD")
+    try:
+        with open(head) as handle:
+            ref = handle.read().strip()
+        if ref.startswith("ref: "):
+            with open(os.path.join(REPO_ROOT, ".git", ref[5:])) as handle:
+                return handle.read().strip()
+        return ref
+    except OSError:
+        return None
+
+def compare(results, baseline_path, threshold):
+    # Prints the change against an earlier run; returns the benchmarks that got slower than the threshold allows
+    with open(os.path.join(LAUNCH_DIR, baseline_path)) as handle:
+        baseline = {(entry["benchmark"], entry["rows"], entry["cols"]): entry for entry in json.load(handle)["results"]}
+    regressions = []
+    print(f"\nagainst {baseline_path}:")
+    for entry in results:
+        old = baseline.get((entry["benchmark"], entry["rows"], entry["cols"]))
+        if not old:
+            continue
+        ratio = entry["seconds_best"] / old["seconds_best"] if old["seconds_best"] else 1.0
+        marker = "  SLOWER" if ratio > 1 + threshold else ""
+        print(f"{entry['benchmark']:<15} {entry['rows']:>5}x{entry['cols']:<5} {ratio:>7.2f}x time{marker}")
+        if marker:
+            regressions.append(entry)
+    return regressions
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Headless benchmarks for maze generation, solving, rendering and game frames.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=None,
+                        help="grid sizes in cells per side (default: %s)" % " ".join(map(str, SIZES)))
+    parser.add_argument("--quick", action="store_true", help="only the small sizes, for a fast sanity check")
+    parser.add_argument("--only", choices=sorted(BENCHMARKS), nargs="+", default=None, help="run only these benchmarks")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark; the best is reported (default: %(default)s)")
+    parser.add_argument("--output", default=None,
+                        help="JSON file for the results (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", default=None, metavar="BASELINE", help="earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="with --compare, exit with status 1 if anything is this much slower (default: %(default)s)")
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    if args.sizes and min(args.sizes) < 2:
+        parser.error("--sizes must be at least 2")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    sizes = args.sizes or (QUICK_SIZES if args.quick else SIZES)
+    names = args.only or list(BENCHMARKS)
+    pygame.init()
+    results = []
+    print(f"{'benchmark':<15} {'size':>11} {'best s':>9} {'throughput':>16} {'peak memory':>12}")
+    for size in sizes:
+        context = Context(size)
+        for name in names:
+            entry = measure(name, context, args.repeat)
+            results.append(entry)
+            print(f"{name:<15} {size:>5}x{size:<5} {entry['seconds_best']:>9.4f} "
+                  f"{entry['throughput']:>11,.0f} {entry['unit'] + '/s':<9} {entry['peak_memory_bytes'] / 2**20:>8.2f} MiB")
+    pygame.quit()
+
+    started = datetime.datetime.now(datetime.timezone.utc)
+    report = {
+        "timestamp": started.isoformat(timespec="seconds"),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "numpy": maze.np.__version__ if maze.np is not None else None,
+        "platform": platform.platform(),
+        "results": results,
+    }
+    output = os.path.join(LAUNCH_DIR, args.output) if args.output else os.path.join(REPO_ROOT, "benchmarks", "results", started.strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as handle:
+        json.dump(report, handle, indent=2)
+    print(f"\nresults written to {output}")
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
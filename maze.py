@@ -1,7 +1,24 @@
 import sys
 import os
+import time
+import argparse
+import csv
+import json
 import pygame
 import random
+import functools
+import heapq
+import mmap
+import struct
+import multiprocessing
+import multiprocessing.pool
+from array import array
+from collections import deque
+
+try:
+    import numpy as np
+except ImportError: # Only needed for the monster swarm and the minimap
+    np = None
 
 # Colors
 WHITE = (245, 245, 245)         # Mist White
@@ -17,6 +34,7 @@ INTERMEDIARYORANGE = (255, 160, 122) # Light Salmon (Used in initial_screen)
 LIGHTBLUE = (173, 216, 230)     # Powder Blue (Fallback Goal legend icon color)
 DARKBLUE = (54, 81, 94)         # Steel Blue (Intro background)
 BEIGE = (245, 222, 179)         # Wheat (Fallback Start legend icon color)
+MAGENTA = (200, 40, 160)        # Orchid (Minimap monsters)
 
 
 # Maze Configuration
@@ -34,16 +52,118 @@ FONTSIZE_START = 28
 FONTSIZE_COMMANDS_INTIAL = 15
 FONTSIZE_MAZE = 14 # For legend text next to icons
 FONTSIZE_MESSAGE = 28 # For win/game over messages
+FONT_PATH = os.path.join("fonts", "Orbitron-VariableFont_wght.ttf")
+TEXT_CACHE_SIZE = 256 # Rendered text surfaces kept by render_text
+
+# Solver animation
+SOLVE_FRAMES = 90 # Frames the BFS replay is squeezed into; 0 shows the result instantly
+
+# Simulation timing
+TICK_RATE = 30 # Simulation ticks per second; monster move delays are counted in ticks
+FPS = 60 # Render rate, independent of TICK_RATE
+MAX_TICKS_PER_FRAME = 5 # Catch-up limit after a slow frame
+INTRO_BLINK_MS = 600 # The intro's start prompt blinks at this interval; the intro sleeps in between
+
+# Frame profiler
+PROFILE_PHASES = ("events", "update", "maze", "sprites", "panel", "overlay", "display")
+PROFILE_WINDOW = 300 # Frames the rolling percentiles are taken over
+PROFILE_REFRESH = 15 # Frames between overlay refreshes, so the numbers stay readable
+
+# Minimap in the info panel, shown when the maze is larger than the window
+MINIMAP_AREA = (WIDTH - 290, HEIGHT + 3, 130, HEIGHT_TOTAL - HEIGHT - 6) # x, y, width, height on screen
+
+# Background maze pre-generation
+POOL_SIZE = 2 # Layouts kept generating ahead of time for restarts
+
+# Headless bot runs (--bot)
+BOT_GAMES = 1000 # Games played per run
+BOT_MOVE_TICKS = 4 # Ticks between a bot's moves, about 7 steps a second: a quick human, not an instant one
+BOT_MAX_TICKS = TICK_RATE * 300 # A game still running after five simulated minutes counts as a timeout
+
+# Endless mode
+ENDLESS_WINDOW_SCREENS = 3 # Rows kept in memory, in screen heights
+
+# Wall bitmask stored per cell in Maze.walls
+WALL_TOP = 1
+WALL_RIGHT = 2
+WALL_BOTTOM = 4
+WALL_LEFT = 8
+ALL_WALLS = WALL_TOP | WALL_RIGHT | WALL_BOTTOM | WALL_LEFT
+OPPOSITE_WALL = {WALL_TOP: WALL_BOTTOM, WALL_BOTTOM: WALL_TOP, WALL_LEFT: WALL_RIGHT, WALL_RIGHT: WALL_LEFT}
+# A direction of movement is named by the wall bit on that side of the cell
+DIRECTION_STEPS = {WALL_TOP: (-1, 0), WALL_RIGHT: (0, 1), WALL_BOTTOM: (1, 0), WALL_LEFT: (0, -1)} # (row, col) deltas
+
+# Binary maze files (save_layout / load_layout): a fixed little-endian header, the monster spawns, then
+# the wall bitmasks packed two cells per byte, the even cell in the low nibble
+MAZE_FILE_MAGIC = b"MAZ1"
+MAZE_FILE_HEADER = struct.Struct("<4sBBHIIqIIIII16s") # magic, version, has_seed, reserved, rows, cols, seed,
+                                                     # start row/col, finish row/col, monster count, algorithm
+MAZE_FILE_SPAWN = struct.Struct("<IIH") # row, col, move_delay
+MAZE_FILE_VERSION = 1
+LOW_NIBBLE = bytes(i & 0x0F for i in range(256)) # bytes.translate tables for packing and unpacking the walls
+HIGH_NIBBLE = bytes(i >> 4 for i in range(256))
+NIBBLE_TO_HIGH = bytes((i << 4) & 0xFF for i in range(256))
+
+# Input recordings (InputRecorder / load_replay): a header with the Game settings, then records of a varint
+# gap (ticks since the previous record) and a one-byte code. Codes 1-8 are a move, by its wall bit.
+REPLAY_FILE_MAGIC = b"MZR1"
+REPLAY_FILE_HEADER = struct.Struct("<4sBBIIIHH16s") # magic, version, flags, monster count, rows, cols, cell size,
+                                                  # tick rate, algorithm
+REPLAY_FILE_VERSION = 2 # 2: the monster count widened to 32 bits for large swarms
+REPLAY_FIXED_LAYOUT = 1 # Header flags: played on a --load-maze file, endless mode, swarm mode
+REPLAY_ENDLESS = 2
+REPLAY_SWARM = 4
+REPLAY_SOLVE = 16 # Q pressed
+REPLAY_END = 32 # Round over; followed by one byte indexing REPLAY_OUTCOMES
+REPLAY_ROUND = 64 # New round; followed by REPLAY_ROUND_SEEDS
+REPLAY_ROUND_SEEDS = struct.Struct("<II") # layout seed (0 for a fixed or endless maze), round seed
+REPLAY_OUTCOMES = ("abandoned", "won", "caught", "solved")
+
+# Cell colour states stored per cell in Maze.cell_state
+STATE_UNVISITED = 0
+STATE_PATH = 1
+STATE_EXPLORED = 2
+STATE_SOLUTION = 3
+STATE_COLORS = (DARKGRAY, YELLOW, PINK, ORANGE)
+COLOR_TO_STATE = {color: state for state, color in enumerate(STATE_COLORS)}
+
+# Per-cell flags stored in Maze.flags
+FLAG_VISITED = 1
+FLAG_EXPLORED = 2
+
+# bytes.translate tables that clear a solver run from cell_state and flags in one pass
+SOLVER_STATES_TO_PATH = bytes(STATE_PATH if i in (STATE_EXPLORED, STATE_SOLUTION) else i for i in range(256))
+CLEAR_EXPLORED = bytes(i & ~FLAG_EXPLORED & 0xFF for i in range(256))
+OPEN_SIDES = bytes(4 - bin(i & ALL_WALLS).count("1") for i in range(256)) # Wall bitmask -> number of openings
+
+_fonts = {}
+
+def get_font(path, size):
+    # One Font per (path, size) for the whole process; path None is the system Arial used by the info panel
+    key = (path, size)
+    font = _fonts.get(key)
+    if font is None:
+        if path is None:
+            try:
+                font = pygame.font.SysFont("arial", size)
+            except Exception as e:
+                print(f"Error loading system font: {e}")
+                font = pygame.font.Font(None, size)
+        else:
+            try:
+                font = pygame.font.Font(path, size)
+            except (FileNotFoundError, OSError):
+                font = get_font(None, size)
+        _fonts[key] = font
+    return font
+
+@functools.lru_cache(maxsize=TEXT_CACHE_SIZE)
+def render_text(message, color, font):
+    # Shared surfaces: callers only blit them, never draw on them
+    return font.render(message, True, color)
 
 def text(background, message, color, size, coordinate_x=None, coordinate_y=None, center=False, align_right=False):
-    font_path = os.path.join("fonts", "Orbitron-VariableFont_wght.ttf")
-    try:
-        font = pygame.font.Font(font_path, size)
-    except FileNotFoundError:
-        # print(f"Warning: Font file '{font_path}' not found. Using default system font.")
-        font = pygame.font.SysFont("arial", size)
-        
-    text_surface = font.render(message, True, color)
+    text_surface = render_text(message, color, get_font(FONT_PATH, size))
     text_rect = text_surface.get_rect()
 
     if center:
@@ -55,408 +175,1810 @@ def text(background, message, color, size, coordinate_x=None, coordinate_y=None,
 
     background.blit(text_surface, text_rect)
 
+def neighbor_steps(num_cols):
+    # (index delta, wall bit) towards each neighbour of a cell in a row-major grid num_cols wide.
+    # Outer walls are never carved, so a neighbour behind an open wall is always inside the grid.
+    return ((-num_cols, WALL_TOP), (num_cols, WALL_BOTTOM), (-1, WALL_LEFT), (1, WALL_RIGHT))
+
+def open_neighbors(walls, num_cols, index):
+    # Cells reachable from index in one step
+    cell_walls = walls[index]
+    return [index + delta for delta, wall in neighbor_steps(num_cols) if not cell_walls & wall]
+
+def solve_bfs(walls, num_rows, num_cols, start, goal):
+    # Breadth-first search over a flat wall bitmask, no pygame involved.
+    # Returns (path, visit_order): the shortest path from start to goal as cell indices ([] if unreachable)
+    # and the cells in the order they were dequeued. Outer walls are never carved, so no bounds checks.
+    total_nodes = num_rows * num_cols
+    parent = array('i', [-1]) * total_nodes
+    visited = bytearray(total_nodes)
+    visited[start] = 1
+    queue = deque([start])
+    visit_order = []
+    found = start == goal
+    steps = neighbor_steps(num_cols)
+    while queue and not found:
+        current = queue.popleft()
+        visit_order.append(current)
+        cell_walls = walls[current]
+        for delta, wall in steps:
+            if cell_walls & wall or visited[current + delta]:
+                continue
+            neighbor = current + delta
+            visited[neighbor] = 1
+            parent[neighbor] = current
+            if neighbor == goal:
+                found = True
+                break
+            queue.append(neighbor)
+    if not found:
+        return [], visit_order
+    return trace_path(parent, start, goal), visit_order
+
+def trace_path(parent, start, end):
+    # Follows parent links from end back to start; returns the cells from start to end
+    path = [end]
+    while path[-1] != start:
+        path.append(parent[path[-1]])
+    path.reverse()
+    return path
+
+# Other solvers, with solve_bfs's signature and return value; visit_order is the cells each one expanded.
+# Registered in SOLVERS below.
+
+def solve_astar(walls, num_rows, num_cols, start, goal):
+    # A* with the Manhattan distance to the goal, which never overestimates on a grid. Ties go to the deeper
+    # cell, so on open stretches the search runs straight at the goal instead of fanning out.
+    total_nodes = num_rows * num_cols
+    goal_row, goal_col = divmod(goal, num_cols)
+    parent = array('i', [-1]) * total_nodes
+    cost = array('i', [-1]) * total_nodes
+    closed = bytearray(total_nodes)
+    cost[start] = 0
+    start_row, start_col = divmod(start, num_cols)
+    heap = [(abs(start_row - goal_row) + abs(start_col - goal_col), 0, start)]
+    visit_order = []
+    steps = neighbor_steps(num_cols)
+    while heap:
+        _, negative_cost, current = heapq.heappop(heap)
+        if closed[current]:
+            continue
+        closed[current] = 1
+        visit_order.append(current)
+        if current == goal:
+            return trace_path(parent, start, goal), visit_order
+        next_cost = 1 - negative_cost
+        cell_walls = walls[current]
+        for delta, wall in steps:
+            if cell_walls & wall:
+                continue
+            neighbor = current + delta
+            if closed[neighbor] or 0 <= cost[neighbor] <= next_cost:
+                continue
+            cost[neighbor] = next_cost
+            parent[neighbor] = current
+            row, col = divmod(neighbor, num_cols)
+            heapq.heappush(heap, (next_cost + abs(row - goal_row) + abs(col - goal_col), -next_cost, neighbor))
+    return [], visit_order
+
+def solve_bidirectional(walls, num_rows, num_cols, start, goal):
+    # Breadth-first from both ends, always growing the smaller frontier by one level, until the two searches
+    # touch. Each side only has to reach about half way, so far less of the maze is covered than by solve_bfs.
+    # A perfect maze has a single path between any two cells, so the first contact is the shortest path.
+    if start == goal:
+        return [start], [start]
+    total_nodes = num_rows * num_cols
+    parent = array('i', [-1]) * total_nodes # Towards start on the start side, towards goal on the goal side
+    side = bytearray(total_nodes)
+    side[start], side[goal] = 1, 2
+    frontiers = {1: [start], 2: [goal]}
+    visit_order = []
+    steps = neighbor_steps(num_cols)
+    while frontiers[1] and frontiers[2]:
+        this = 1 if len(frontiers[1]) <= len(frontiers[2]) else 2
+        next_frontier = []
+        for current in frontiers[this]:
+            visit_order.append(current)
+            cell_walls = walls[current]
+            for delta, wall in steps:
+                if cell_walls & wall:
+                    continue
+                neighbor = current + delta
+                if side[neighbor] == this:
+                    continue
+                if side[neighbor]:
+                    start_side, goal_side = (current, neighbor) if this == 1 else (neighbor, current)
+                    path = trace_path(parent, start, start_side)
+                    path.extend(reversed(trace_path(parent, goal, goal_side)))
+                    return path, visit_order
+                side[neighbor] = this
+                parent[neighbor] = current
+                next_frontier.append(neighbor)
+        frontiers[this] = next_frontier
+    return [], visit_order
+
+def fill_dead_ends(walls, num_rows, num_cols, keep=()):
+    # Dead-end filling: cells with at most one opening (other than the kept ones) are filled in, which can turn
+    # their neighbour into a dead end, and so on. In a perfect maze exactly the corridor joining the kept cells
+    # survives. Returns (alive, filled): a bytearray with 1 for every surviving cell, and the filled cells in order.
+    total_nodes = num_rows * num_cols
+    keep = set(keep)
+    degree = bytearray(walls.tobytes().translate(OPEN_SIDES))
+    alive = bytearray(b"\x01") * total_nodes
+    stack = [index for index in range(total_nodes) if degree[index] <= 1 and index not in keep]
+    filled = []
+    steps = neighbor_steps(num_cols)
+    while stack:
+        current = stack.pop()
+        if not alive[current]:
+            continue
+        alive[current] = 0
+        filled.append(current)
+        cell_walls = walls[current]
+        for delta, wall in steps:
+            neighbor = current + delta
+            if cell_walls & wall or not alive[neighbor]:
+                continue
+            degree[neighbor] -= 1
+            if degree[neighbor] <= 1 and neighbor not in keep:
+                stack.append(neighbor)
+    return alive, filled
+
+def solve_dead_end_fill(walls, num_rows, num_cols, start, goal):
+    # Prunes the maze down to the start-goal corridor with fill_dead_ends, then walks it. visit_order is the
+    # filled cells followed by the corridor. This is the most work of all solvers, but it needs no queue or
+    # parent links and shows the whole maze being eliminated.
+    alive, filled = fill_dead_ends(walls, num_rows, num_cols, (start, goal))
+    path = [start]
+    previous, current = -1, start
+    steps = neighbor_steps(num_cols)
+    while current != goal and len(path) <= num_rows * num_cols:
+        cell_walls = walls[current]
+        following = [current + delta for delta, wall in steps
+                     if not cell_walls & wall and alive[current + delta] and current + delta != previous]
+        if len(following) != 1: # Cut off, or a loop the filling could not remove: not a perfect maze
+            return [], filled
+        previous, current = current, following[0]
+        path.append(current)
+    if current != goal:
+        return [], filled
+    return path, filled + path
+
+def goal_tree(walls, num_rows, num_cols, goal):
+    # One BFS from the goal: for every cell, the next cell on its shortest path to the goal (-1 for the goal
+    # itself and for unreachable cells). The goal never moves, so the solution from anywhere is then a walk.
+    total_nodes = num_rows * num_cols
+    parent = array('i', [-1]) * total_nodes
+    visited = bytearray(total_nodes)
+    visited[goal] = 1
+    queue = deque([goal])
+    steps = neighbor_steps(num_cols)
+    while queue:
+        current = queue.popleft()
+        cell_walls = walls[current]
+        for delta, wall in steps:
+            if cell_walls & wall or visited[current + delta]:
+                continue
+            neighbor = current + delta
+            visited[neighbor] = 1
+            parent[neighbor] = current
+            queue.append(neighbor)
+    return parent
+
+def path_to_goal(parent, start, goal):
+    # O(path) on a goal_tree; [] if start cannot reach the goal
+    if start != goal and parent[start] < 0:
+        return []
+    path = [start]
+    while path[-1] != goal:
+        path.append(parent[path[-1]])
+    return path
+
+SOLVERS = {
+    "bfs": solve_bfs,
+    "astar": solve_astar,
+    "bidirectional": solve_bidirectional,
+    "dead-end-fill": solve_dead_end_fill,
+}
+DEFAULT_SOLVER = "bfs"
+GOAL_TREE_SOLVER = "goal-tree" # Not in SOLVERS: it walks the Maze's precomputed goal_tree instead of searching
+
+def run_solver(name, walls, num_rows, num_cols, start, goal):
+    # (path, visit_order, seconds) for the named SOLVERS entry
+    try:
+        solver = SOLVERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown solver '{name}', expected one of: {', '.join(SOLVERS)}")
+    started = time.perf_counter()
+    path, visit_order = solver(walls, num_rows, num_cols, start, goal)
+    return path, visit_order, time.perf_counter() - started
+
+def distance_field(walls, num_rows, num_cols, source, targets=None):
+    # Maze distance from source to every cell (-1 where unreachable) as a flat array, by breadth-first search.
+    # With targets, the search stops once all of them are labelled; cells farther out stay -1.
+    total_nodes = num_rows * num_cols
+    distances = array('i', [-1]) * total_nodes
+    distances[source] = 0
+    remaining = set(targets) if targets is not None else None
+    if remaining is not None:
+        remaining.discard(source)
+        if not remaining:
+            return distances
+    queue = deque([source])
+    steps = neighbor_steps(num_cols)
+    while queue:
+        current = queue.popleft()
+        next_distance = distances[current] + 1
+        cell_walls = walls[current]
+        for delta, wall in steps:
+            if cell_walls & wall or distances[current + delta] >= 0:
+                continue
+            neighbor = current + delta
+            distances[neighbor] = next_distance
+            queue.append(neighbor)
+            if remaining is not None:
+                remaining.discard(neighbor)
+                if not remaining:
+                    return distances
+    return distances
+
+def chase_step(walls, num_cols, index, distances, rng=random):
+    # A chaser's next cell on a distance field: the open neighbour closest to the field's source, ties broken
+    # by rng. Returns index itself when no neighbour is closer, and None when index is not on the field.
+    best_distance = distances[index]
+    if best_distance < 0:
+        return None
+    best_cells = []
+    for neighbor in open_neighbors(walls, num_cols, index):
+        distance = distances[neighbor]
+        if 0 <= distance < best_distance:
+            best_distance, best_cells = distance, [neighbor]
+        elif distance == best_distance and best_cells:
+            best_cells.append(neighbor)
+    return rng.choice(best_cells) if best_cells else index
+
+# Maze generators. Each carves a perfect maze into walls (already all ALL_WALLS) using rng, calling
+# on_carve(index) (when given) for every cell as it joins the maze. Registered in GENERATORS below.
+
+def generate_backtracker(walls, num_rows, num_cols, rng, on_carve=None):
+    # Iterative randomized depth-first search: long winding corridors, few dead ends
+    total_nodes = num_rows * num_cols
+    visited = bytearray(total_nodes)
+    current = rng.randrange(total_nodes)
+    visited[current] = 1
+    if on_carve: on_carve(current)
+    # The grid is fully connected, so one backtracking walk from any cell carves every cell
+    stack = [current]
+    while stack:
+        current = stack[-1]
+        row, col = divmod(current, num_cols)
+        candidates = []
+        if row > 0 and not visited[current - num_cols]: candidates.append((current - num_cols, WALL_TOP))
+        if row < num_rows - 1 and not visited[current + num_cols]: candidates.append((current + num_cols, WALL_BOTTOM))
+        if col > 0 and not visited[current - 1]: candidates.append((current - 1, WALL_LEFT))
+        if col < num_cols - 1 and not visited[current + 1]: candidates.append((current + 1, WALL_RIGHT))
+
+        if candidates:
+            neighbor, wall = rng.choice(candidates)
+            walls[current] &= ALL_WALLS ^ wall
+            walls[neighbor] &= ALL_WALLS ^ OPPOSITE_WALL[wall]
+            visited[neighbor] = 1
+            stack.append(neighbor)
+            if on_carve: on_carve(neighbor)
+        else:
+            stack.pop()
+
+def generate_kruskal(walls, num_rows, num_cols, rng, on_carve=None):
+    # Randomized Kruskal: removes walls in random order whenever they join two different union-find sets
+    total_nodes = num_rows * num_cols
+    edges = [(index, WALL_RIGHT) for index in range(total_nodes) if index % num_cols < num_cols - 1]
+    edges += [(index, WALL_BOTTOM) for index in range(total_nodes - num_cols)]
+    rng.shuffle(edges)
+    sets = array('i', range(total_nodes))
+
+    def find(index):
+        while sets[index] != index:
+            sets[index] = sets[sets[index]] # Path halving
+            index = sets[index]
+        return index
+
+    for index, wall in edges:
+        neighbor = index + 1 if wall == WALL_RIGHT else index + num_cols
+        root_a, root_b = find(index), find(neighbor)
+        if root_a == root_b:
+            continue
+        sets[root_b] = root_a
+        walls[index] &= ALL_WALLS ^ wall
+        walls[neighbor] &= ALL_WALLS ^ OPPOSITE_WALL[wall]
+        if on_carve:
+            on_carve(index)
+            on_carve(neighbor)
+
+def generate_prim(walls, num_rows, num_cols, rng, on_carve=None):
+    # Randomized Prim: grows from one cell by attaching a random frontier cell; many short dead ends
+    total_nodes = num_rows * num_cols
+    in_maze = bytearray(total_nodes)
+    in_frontier = bytearray(total_nodes)
+    frontier = []
+
+    def add(index):
+        in_maze[index] = 1
+        if on_carve: on_carve(index)
+        row, col = divmod(index, num_cols)
+        for neighbor, inside in ((index - num_cols, row > 0), (index + num_cols, row < num_rows - 1),
+                                 (index - 1, col > 0), (index + 1, col < num_cols - 1)):
+            if inside and not in_maze[neighbor] and not in_frontier[neighbor]:
+                in_frontier[neighbor] = 1
+                frontier.append(neighbor)
+
+    add(rng.randrange(total_nodes))
+    while frontier:
+        # Swap-remove keeps picking a random frontier cell O(1)
+        pick = rng.randrange(len(frontier))
+        frontier[pick], frontier[-1] = frontier[-1], frontier[pick]
+        current = frontier.pop()
+        row, col = divmod(current, num_cols)
+        links = []
+        if row > 0 and in_maze[current - num_cols]: links.append((current - num_cols, WALL_TOP))
+        if row < num_rows - 1 and in_maze[current + num_cols]: links.append((current + num_cols, WALL_BOTTOM))
+        if col > 0 and in_maze[current - 1]: links.append((current - 1, WALL_LEFT))
+        if col < num_cols - 1 and in_maze[current + 1]: links.append((current + 1, WALL_RIGHT))
+        neighbor, wall = rng.choice(links)
+        walls[current] &= ALL_WALLS ^ wall
+        walls[neighbor] &= ALL_WALLS ^ OPPOSITE_WALL[wall]
+        add(current)
+
+def generate_wilson(walls, num_rows, num_cols, rng, on_carve=None):
+    # Wilson's loop-erased random walks: an unbiased sample of all perfect mazes
+    total_nodes = num_rows * num_cols
+    in_maze = bytearray(total_nodes)
+    # Unvisited cells with their positions, so a random one is picked and removed in O(1)
+    unvisited = list(range(total_nodes))
+    position = array('i', range(total_nodes))
+    next_step = array('i', [-1]) * total_nodes
+
+    def remove_unvisited(index):
+        last = unvisited.pop()
+        if last != index:
+            slot = position[index]
+            unvisited[slot] = last
+            position[last] = slot
+
+    first = rng.randrange(total_nodes)
+    in_maze[first] = 1
+    remove_unvisited(first)
+    if on_carve: on_carve(first)
+    while unvisited:
+        start = unvisited[rng.randrange(len(unvisited))]
+        current = start
+        # Random walk until it hits the maze; overwriting next_step erases loops for free
+        while not in_maze[current]:
+            row, col = divmod(current, num_cols)
+            moves = []
+            if row > 0: moves.append(current - num_cols)
+            if row < num_rows - 1: moves.append(current + num_cols)
+            if col > 0: moves.append(current - 1)
+            if col < num_cols - 1: moves.append(current + 1)
+            next_step[current] = rng.choice(moves)
+            current = next_step[current]
+        current = start
+        while not in_maze[current]:
+            neighbor = next_step[current]
+            delta = neighbor - current
+            wall = WALL_BOTTOM if delta == num_cols else WALL_TOP if delta == -num_cols else WALL_RIGHT if delta == 1 else WALL_LEFT
+            walls[current] &= ALL_WALLS ^ wall
+            walls[neighbor] &= ALL_WALLS ^ OPPOSITE_WALL[wall]
+            in_maze[current] = 1
+            remove_unvisited(current)
+            if on_carve: on_carve(current)
+            current = neighbor
+
+class EllerRows():
+    # Eller's algorithm as a stream: each next_row() returns the walls of one more row using O(num_cols) memory,
+    # so a maze can grow downwards forever. Pass last=True to close the maze off with a fully joined final row.
+    def __init__(self, num_cols, rng):
+        self.num_cols = num_cols
+        self.rng = rng
+        self.row_sets = array('i', range(num_cols))
+        self.next_set = num_cols
+        self.open_above = bytearray(num_cols) # Columns whose cell in the previous row carved down
+
+    def __iter__(self):
+        while True:
+            yield self.next_row()
+
+    def next_row(self, last=False):
+        num_cols, rng, row_sets = self.num_cols, self.rng, self.row_sets
+        row_walls = array('B', [ALL_WALLS]) * num_cols
+        for col in range(num_cols):
+            if self.open_above[col]: row_walls[col] &= ALL_WALLS ^ WALL_TOP
+        members = {}
+        for col in range(num_cols):
+            members.setdefault(row_sets[col], []).append(col)
+        # Randomly join adjacent cells of different sets; the last row must join all of them
+        for col in range(num_cols - 1):
+            set_a, set_b = row_sets[col], row_sets[col + 1]
+            if set_a != set_b and (last or rng.random() < 0.5):
+                row_walls[col] &= ALL_WALLS ^ WALL_RIGHT
+                row_walls[col + 1] &= ALL_WALLS ^ WALL_LEFT
+                if len(members[set_a]) < len(members[set_b]): set_a, set_b = set_b, set_a
+                # Relabel the smaller set so a row costs O(cols log cols) at worst
+                for other in members[set_b]: row_sets[other] = set_a
+                members[set_a].extend(members.pop(set_b))
+        if last:
+            return row_walls
+        # Every set carves down at least once; cells that do not carve down start a new set
+        open_above = bytearray(num_cols)
+        next_sets = array('i', [-1]) * num_cols
+        for set_id, cols in members.items():
+            rng.shuffle(cols)
+            for position, col in enumerate(cols):
+                if position == 0 or rng.random() < 0.3:
+                    row_walls[col] &= ALL_WALLS ^ WALL_BOTTOM
+                    open_above[col] = 1
+                    next_sets[col] = set_id
+        for col in range(num_cols):
+            if next_sets[col] < 0:
+                next_sets[col] = self.next_set
+                self.next_set += 1
+        self.row_sets = next_sets
+        self.open_above = open_above
+        return row_walls
+
+def generate_eller(walls, num_rows, num_cols, rng, on_carve=None):
+    # Eller's algorithm: one row at a time, tracking only which set each cell of the current row belongs to
+    rows = EllerRows(num_cols, rng)
+    for row in range(num_rows):
+        base = row * num_cols
+        walls[base:base + num_cols] = rows.next_row(last=row == num_rows - 1)
+        if on_carve:
+            for col in range(num_cols): on_carve(base + col)
+
+def generate_binary_tree(walls, num_rows, num_cols, rng, on_carve=None):
+    # Each cell opens north or west: very fast, but with a strong diagonal bias and open top row/left column
+    for index in range(num_rows * num_cols):
+        row, col = divmod(index, num_cols)
+        if row > 0 and col > 0:
+            wall = WALL_TOP if rng.random() < 0.5 else WALL_LEFT
+        elif row > 0:
+            wall = WALL_TOP
+        elif col > 0:
+            wall = WALL_LEFT
+        else:
+            if on_carve: on_carve(index)
+            continue
+        neighbor = index - num_cols if wall == WALL_TOP else index - 1
+        walls[index] &= ALL_WALLS ^ wall
+        walls[neighbor] &= ALL_WALLS ^ OPPOSITE_WALL[wall]
+        if on_carve: on_carve(index)
+
+def generate_sidewinder(walls, num_rows, num_cols, rng, on_carve=None):
+    # Sidewinder: horizontal runs that each open north once; the top row is a single corridor
+    for row in range(num_rows):
+        base = row * num_cols
+        run_start = 0
+        for col in range(num_cols):
+            index = base + col
+            close_run = col == num_cols - 1 or (row > 0 and rng.random() < 0.5)
+            if close_run:
+                if row > 0:
+                    up = base + rng.randrange(run_start, col + 1)
+                    walls[up] &= ALL_WALLS ^ WALL_TOP
+                    walls[up - num_cols] &= ALL_WALLS ^ WALL_BOTTOM
+                run_start = col + 1
+            else:
+                walls[index] &= ALL_WALLS ^ WALL_RIGHT
+                walls[index + 1] &= ALL_WALLS ^ WALL_LEFT
+            if on_carve: on_carve(index)
+
+GENERATORS = {
+    "backtracker": generate_backtracker,
+    "kruskal": generate_kruskal,
+    "prim": generate_prim,
+    "wilson": generate_wilson,
+    "eller": generate_eller,
+    "binary-tree": generate_binary_tree,
+    "sidewinder": generate_sidewinder,
+}
+DEFAULT_GENERATOR = "backtracker"
+
+def generate_maze(num_rows, num_cols, seed=None, walls=None, progress=None, progress_interval=None, algorithm=DEFAULT_GENERATOR):
+    # Carves a perfect maze with the named GENERATORS algorithm and returns its flat wall bitmask (one byte per cell).
+    # Pure and display-free: pass walls to carve in place, and progress to be called with the list of cells
+    # carved since the previous call every progress_interval cells (default ~1% of the grid) and once at the end.
+    try:
+        generator = GENERATORS[algorithm]
+    except KeyError:
+        raise ValueError(f"Unknown maze algorithm '{algorithm}', expected one of: {', '.join(GENERATORS)}")
+    total_nodes = num_rows * num_cols
+    if walls is None:
+        walls = array('B', [ALL_WALLS]) * total_nodes
+    else:
+        walls[:] = array('B', [ALL_WALLS]) * total_nodes
+    if total_nodes == 0:
+        return walls
+    rng = random.Random(seed)
+    if progress is None:
+        generator(walls, num_rows, num_cols, rng)
+        return walls
+
+    interval = progress_interval or max(1, total_nodes // 100)
+    carved = []
+
+    def on_carve(index):
+        carved.append(index)
+        if len(carved) >= interval:
+            progress(carved[:])
+            carved.clear()
+
+    generator(walls, num_rows, num_cols, rng, on_carve)
+    if carved:
+        progress(carved)
+    return walls
+
+def maze_character(walls, num_rows, num_cols):
+    # Share of cells by number of openings: dead ends (1), corridors (2, split into straight and turn) and junctions (3+)
+    total_nodes = num_rows * num_cols
+    counts = {"dead_ends": 0, "straight": 0, "turns": 0, "junctions": 0}
+    for cell_walls in walls:
+        openings = 4 - bin(cell_walls).count("1")
+        if openings <= 1: counts["dead_ends"] += 1
+        elif openings >= 3: counts["junctions"] += 1
+        elif cell_walls in (WALL_TOP | WALL_BOTTOM, WALL_LEFT | WALL_RIGHT): counts["straight"] += 1
+        else: counts["turns"] += 1
+    return {name: count / total_nodes for name, count in counts.items()} if total_nodes else counts
+
+def compare_generators(num_rows, num_cols, seed=None):
+    # Times every registered generator on the same grid and prints its speed and character
+    print(f"{'algorithm':<12} {'seconds':>8} {'cells/s':>11} {'dead ends':>10} {'straight':>9} {'turns':>7} {'junctions':>10}")
+    for name in GENERATORS:
+        started = time.perf_counter()
+        walls = generate_maze(num_rows, num_cols, seed, algorithm=name)
+        elapsed = time.perf_counter() - started
+        character = maze_character(walls, num_rows, num_cols)
+        rate = num_rows * num_cols / elapsed if elapsed else float("inf")
+        print(f"{name:<12} {elapsed:>8.3f} {rate:>11,.0f} {character['dead_ends']:>10.1%} {character['straight']:>9.1%} "
+              f"{character['turns']:>7.1%} {character['junctions']:>10.1%}")
+
+def compare_solvers(num_rows, num_cols, seed=None, algorithm=DEFAULT_GENERATOR):
+    # Runs every registered solver between the same start and goal (placed as in the game) and prints
+    # the wall time and the number of cells each one expanded
+    rng = random.Random(seed)
+    walls = generate_maze(num_rows, num_cols, rng.getrandbits(32), algorithm=algorithm)
+    (start_row, start_col), (goal_row, goal_col), _ = place_start_finish(walls, num_rows, num_cols, rng)
+    start, goal = start_row * num_cols + start_col, goal_row * num_cols + goal_col
+    total_nodes = num_rows * num_cols
+    print(f"{num_rows}x{num_cols} {algorithm} maze, start {(start_row, start_col)}, goal {(goal_row, goal_col)}")
+    print(f"{'solver':<14} {'seconds':>8} {'expanded':>11} {'of cells':>9} {'path':>9}")
+    for name in SOLVERS:
+        path, visit_order, seconds = run_solver(name, walls, num_rows, num_cols, start, goal)
+        print(f"{name:<14} {seconds:>8.3f} {len(visit_order):>11,} {len(visit_order) / total_nodes:>9.1%} {len(path):>9,}")
+    started = time.perf_counter()
+    parent = goal_tree(walls, num_rows, num_cols, goal)
+    built = time.perf_counter() - started
+    started = time.perf_counter()
+    path = path_to_goal(parent, start, goal)
+    seconds = time.perf_counter() - started
+    print(f"{GOAL_TREE_SOLVER:<14} {seconds:>8.3f} {len(path):>11,} {len(path) / total_nodes:>9.1%} {len(path):>9,}"
+          f"   (tree built once in {built:.3f}s)")
+
+def fit_size(width, height, max_width, max_height):
+    # Largest size with the image's aspect ratio that fits in max_width x max_height (at least 1x1)
+    if height == 0: aspect_ratio = 1
+    else: aspect_ratio = width / float(height)
+    if width > height:
+        fit_width = max_width
+        fit_height = int(fit_width / aspect_ratio) if aspect_ratio != 0 else max_height
+        if fit_height > max_height:
+            fit_height = max_height
+            fit_width = int(fit_height * aspect_ratio)
+    else:
+        fit_height = max_height
+        fit_width = int(fit_height * aspect_ratio)
+        if fit_width > max_width:
+            fit_width = max_width
+            fit_height = int(fit_width / aspect_ratio) if aspect_ratio != 0 else max_height
+    return max(1, fit_width), max(1, fit_height)
+
+def draw_cell_walls(surface, walls, pos_x, pos_y, size):
+    # The four edges of a cell: BLACK where a wall stands, path colour where it is open
+    pygame.draw.rect(surface, BLACK if walls & WALL_TOP else YELLOW, [pos_x, pos_y, size, BORDER_THICKNESS])
+    pygame.draw.rect(surface, BLACK if walls & WALL_BOTTOM else YELLOW, [pos_x, pos_y + size - BORDER_THICKNESS, size, BORDER_THICKNESS])
+    pygame.draw.rect(surface, BLACK if walls & WALL_RIGHT else YELLOW, [pos_x + size - BORDER_THICKNESS, pos_y, BORDER_THICKNESS, size])
+    pygame.draw.rect(surface, BLACK if walls & WALL_LEFT else YELLOW, [pos_x, pos_y, BORDER_THICKNESS, size])
+
+class AssetManager():
+    # Loads each image file once per process and keeps every scaled variant, so restarts do no file I/O.
+    # Missing files are remembered too (as None) and only reported the first time.
+    def __init__(self):
+        self.images = {}
+        self.scaled_images = {}
+        self.wall_atlases = {}
+
+    def load(self, path):
+        if path not in self.images:
+            try:
+                self.images[path] = pygame.image.load(path).convert_alpha()
+            except (pygame.error, OSError) as e:
+                print(f"Error: Could not load image at '{path}': {e}")
+                self.images[path] = None
+        return self.images[path]
+
+    def scaled(self, path, size):
+        key = (path, size)
+        if key not in self.scaled_images:
+            image = self.load(path)
+            self.scaled_images[key] = pygame.transform.smoothscale(image, size) if image else None
+        return self.scaled_images[key]
+
+    def fit(self, path, max_width, max_height):
+        # Scaled to fit inside max_width x max_height, keeping the aspect ratio
+        image = self.load(path)
+        if image is None:
+            return None
+        return self.scaled(path, fit_size(*image.get_size(), max_width, max_height))
+
+    def wall_atlas(self, cell_size):
+        # Every cell look at this size, drawn once: a 16 x len(STATE_COLORS) grid of tiles, one column per wall
+        # bitmask and one row per cell state. Returns (atlas, areas) with areas[state << 4 | walls] the tile's rect.
+        if cell_size not in self.wall_atlases:
+            atlas = pygame.Surface((16 * cell_size, len(STATE_COLORS) * cell_size))
+            if pygame.display.get_surface():
+                atlas = atlas.convert()
+            areas = [None] * (len(STATE_COLORS) << 4)
+            for state, color in enumerate(STATE_COLORS):
+                for walls in range(16):
+                    area = pygame.Rect(walls * cell_size, state * cell_size, cell_size, cell_size)
+                    atlas.fill(color, area)
+                    draw_cell_walls(atlas, walls, area.x, area.y, cell_size)
+                    areas[state << 4 | walls] = area
+            self.wall_atlases[cell_size] = (atlas, areas)
+        return self.wall_atlases[cell_size]
+
+    def clear(self):
+        self.images.clear()
+        self.scaled_images.clear()
+        self.wall_atlases.clear()
+
+ASSETS = AssetManager()
+
+MIN_DIST_MONSTER_FROM_PLAYER = 7 # Maze steps between the start and any monster spawn
+GOAL_DISTANCE_FRACTION = 0.9 # The goal is drawn from cells at least this share of the longest path from the start
+
+def place_start_finish(walls, num_rows, num_cols, rng=random):
+    # Start and goal by real path length on the carved maze. A BFS from a random cell ends at one end of the
+    # maze's longest path (in a perfect maze); that cell is the start, and a second BFS from it picks the goal
+    # among the cells near the far end. Returns (start, finish, distances from the start).
+    spread = distance_field(walls, num_rows, num_cols, rng.randrange(num_rows * num_cols))
+    start = max(range(len(spread)), key=spread.__getitem__)
+    distances = distance_field(walls, num_rows, num_cols, start)
+    longest = max(distances)
+    threshold = max(1, int(longest * GOAL_DISTANCE_FRACTION))
+    finish = rng.choice([index for index, distance in enumerate(distances) if distance >= threshold])
+    return divmod(start, num_cols), divmod(finish, num_cols), distances
+
+def place_monsters(distances, num_cols, start, finish, count, rng=random, min_distance=MIN_DIST_MONSTER_FROM_PLAYER,
+                   max_distance=None, swarm=False):
+    # (row, col, move_delay) for each monster, from distances (maze distance from the start, as returned by
+    # place_start_finish). Spawns are drawn without repeats from the cells whose distance is in
+    # [min_distance, max_distance]. If the band is too small, the farthest remaining cells are used.
+    # Beyond one monster per cell, monsters share cells. One pass over the cells, and it always succeeds.
+    excluded = {start[0] * num_cols + start[1], finish[0] * num_cols + finish[1]}
+    in_band, out_of_band = [], []
+    for index, distance in enumerate(distances):
+        if index in excluded:
+            continue
+        if distance >= min_distance and (max_distance is None or distance <= max_distance):
+            in_band.append(index)
+        else:
+            out_of_band.append(index)
+    cells = rng.sample(in_band, min(count, len(in_band)))
+    if len(cells) < count:
+        out_of_band.sort(key=distances.__getitem__, reverse=True)
+        cells.extend(out_of_band[:count - len(cells)])
+    if len(cells) < count and cells:
+        cells.extend(rng.choices(cells, k=count - len(cells)))
+    if swarm:
+        return [(*divmod(index, num_cols), rng.randint(20, 30)) for index in cells]
+    return [(*divmod(index, num_cols), rng.randint(20, 25 + i*5)) for i, index in enumerate(cells)]
+
+class MazeLayout():
+    # A carved maze with start, goal and monster spawns already chosen; plain data, so it pickles between processes
+    def __init__(self, num_rows, num_cols, walls, start, finish, monsters, seed=None, algorithm=DEFAULT_GENERATOR,
+                 goal_parent=None):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self.walls = walls
+        self.start = start # (row, col)
+        self.finish = finish # (row, col)
+        self.monsters = monsters # [(row, col, move_delay)]
+        self.seed = seed
+        self.algorithm = algorithm
+        self.goal_parent = goal_parent # goal_tree for finish, when already computed
+
+def place_layout(walls, num_rows, num_cols, num_monsters=2, rng=random, swarm=False, seed=None, algorithm=DEFAULT_GENERATOR,
+                 min_distance=MIN_DIST_MONSTER_FROM_PLAYER):
+    # Start, goal, spawns and the goal tree for an already carved maze: four BFS passes over it in all, done
+    # here so that pool workers take them off the game's thread
+    start, finish, distances = place_start_finish(walls, num_rows, num_cols, rng)
+    monsters = place_monsters(distances, num_cols, start, finish, num_monsters, rng, min_distance, swarm=swarm)
+    parent = goal_tree(walls, num_rows, num_cols, finish[0] * num_cols + finish[1])
+    return MazeLayout(num_rows, num_cols, walls, start, finish, monsters, seed, algorithm, parent)
+
+def build_layout(num_rows, num_cols, num_monsters=2, seed=None, algorithm=DEFAULT_GENERATOR, swarm=False,
+                 min_distance=MIN_DIST_MONSTER_FROM_PLAYER):
+    # Display-free, so it can run in a worker thread or process
+    rng = random.Random(seed)
+    walls = generate_maze(num_rows, num_cols, rng.getrandbits(32), algorithm=algorithm)
+    return place_layout(walls, num_rows, num_cols, num_monsters, rng, swarm, seed, algorithm, min_distance)
+
+def pack_walls(walls):
+    # One wall bitmask per byte -> two per byte, without a Python-level loop over the cells
+    cells = walls.tobytes() + bytes(len(walls) & 1)
+    low = int.from_bytes(cells[0::2], "little")
+    high = int.from_bytes(cells[1::2].translate(NIBBLE_TO_HIGH), "little")
+    return (low | high).to_bytes(len(cells) // 2, "little")
+
+def unpack_walls(packed, num_cells):
+    walls = array('B', bytes(2 * len(packed)))
+    walls[0::2] = array('B', packed.translate(LOW_NIBBLE))
+    walls[1::2] = array('B', packed.translate(HIGH_NIBBLE))
+    del walls[num_cells:]
+    return walls
+
+def save_layout(layout, path):
+    # Writes a MazeLayout in the binary maze format: a 2000x2000 maze takes about 2 MB
+    seed = layout.seed if layout.seed is not None and -2**63 <= layout.seed < 2**63 else None
+    header = MAZE_FILE_HEADER.pack(MAZE_FILE_MAGIC, MAZE_FILE_VERSION, seed is not None, 0, layout.num_rows, layout.num_cols,
+                                   seed or 0, *layout.start, *layout.finish, len(layout.monsters),
+                                   layout.algorithm.encode("ascii"))
+    with open(path, "wb") as handle:
+        handle.write(header)
+        handle.write(b"".join(MAZE_FILE_SPAWN.pack(*spawn) for spawn in layout.monsters))
+        handle.write(pack_walls(layout.walls))
+
+def load_layout(path):
+    # Maps the file instead of reading it: the header and spawns are decoded in place and only the packed
+    # walls are touched, by two bytes.translate passes. Raises ValueError for anything that is not a maze file.
+    with open(path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        if len(data) < MAZE_FILE_HEADER.size or data[:4] != MAZE_FILE_MAGIC:
+            raise ValueError(f"{path} is not a maze file")
+        magic, version, has_seed, _, num_rows, num_cols, seed, start_row, start_col, finish_row, finish_col, \
+            num_monsters, algorithm = MAZE_FILE_HEADER.unpack_from(data)
+        if version != MAZE_FILE_VERSION:
+            raise ValueError(f"{path} has maze format version {version}, expected {MAZE_FILE_VERSION}")
+        walls_offset = MAZE_FILE_HEADER.size + num_monsters * MAZE_FILE_SPAWN.size
+        num_cells = num_rows * num_cols
+        if len(data) != walls_offset + (num_cells + 1) // 2:
+            raise ValueError(f"{path} is truncated or has trailing data")
+        if not (start_row < num_rows and finish_row < num_rows and start_col < num_cols and finish_col < num_cols):
+            raise ValueError(f"{path} has its start or goal outside the maze")
+        monsters = [MAZE_FILE_SPAWN.unpack_from(data, MAZE_FILE_HEADER.size + i * MAZE_FILE_SPAWN.size)
+                    for i in range(num_monsters)]
+        if any(row >= num_rows or col >= num_cols for row, col, _ in monsters):
+            raise ValueError(f"{path} has a monster spawn outside the maze")
+        algorithm = algorithm.rstrip(b"\0").decode("ascii", errors="replace")
+        if algorithm not in GENERATORS:
+            raise ValueError(f"{path} was carved with an unknown maze algorithm '{algorithm}'")
+        walls = unpack_walls(data[walls_offset:], num_cells)
+    # Nothing that walks the maze bounds-checks its steps: they rely on the outer walls being closed
+    borders = ((walls[:num_cols], WALL_TOP), (walls[num_cells - num_cols:], WALL_BOTTOM),
+               (walls[::num_cols], WALL_LEFT), (walls[num_cols - 1::num_cols], WALL_RIGHT))
+    if not all(cell_walls & wall for cells, wall in borders for cell_walls in cells):
+        raise ValueError(f"{path} has an opening in the maze's outer walls")
+    return MazeLayout(num_rows, num_cols, walls, (start_row, start_col), (finish_row, finish_col), monsters,
+                      seed if has_seed else None, algorithm)
+
+def write_varint(data, value):
+    # LEB128: seven bits per byte, low bits first, the top bit set on every byte but the last
+    while value >= 0x80:
+        data.append(value & 0x7F | 0x80)
+        value >>= 7
+    data.append(value)
+
+def read_varint(data, offset):
+    # Returns (value, offset past it); IndexError when data ends inside it
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+class InputRecorder():
+    # The player's input for a session, tick by tick, in the replay format. A tick without input costs
+    # nothing and a move costs two bytes, so an hour of play stays in the tens of kilobytes. Kept in memory until save().
+    def __init__(self, num_rows, num_cols, num_monsters, algorithm, cell_size=SIZE, tick_rate=TICK_RATE, flags=0):
+        self.data = bytearray(REPLAY_FILE_HEADER.pack(REPLAY_FILE_MAGIC, REPLAY_FILE_VERSION, flags, num_monsters,
+                                                      num_rows, num_cols, cell_size, tick_rate, algorithm.encode("ascii")))
+        self.gap = 0 # Ticks since the last record
+        self.in_round = False
+
+    def add(self, code):
+        write_varint(self.data, self.gap)
+        self.data.append(code)
+        self.gap = 0
+
+    def start_round(self, layout_seed, round_seed):
+        self.gap = 0
+        self.add(REPLAY_ROUND)
+        self.data += REPLAY_ROUND_SEEDS.pack(layout_seed, round_seed)
+        self.in_round = True
+
+    def tick(self, directions):
+        # The moves applied at the start of this tick
+        for direction in directions:
+            self.add(direction)
+        self.gap += 1
+
+    def solve(self):
+        self.add(REPLAY_SOLVE)
+
+    def end_round(self, outcome):
+        if not self.in_round:
+            return
+        self.add(REPLAY_END)
+        self.data.append(REPLAY_OUTCOMES.index(outcome))
+        self.in_round = False
+
+    def save(self, path):
+        with open(path, "wb") as handle:
+            handle.write(self.data)
+
+class ReplayRound():
+    # One recorded round: its seeds, the moves by tick, the tick Q was pressed on and how it ended
+    def __init__(self, layout_seed, round_seed):
+        self.layout_seed = layout_seed
+        self.round_seed = round_seed
+        self.moves = {} # tick -> [wall bit]
+        self.solve_tick = None
+        self.ticks = 0 # Ticks run before the round ended
+        self.outcome = None
+
+class Replay():
+    # A decoded recording: the settings to rebuild the Game with and its rounds
+    def __init__(self, num_rows, num_cols, num_monsters, algorithm, cell_size, tick_rate, flags):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self.num_monsters = num_monsters
+        self.algorithm = algorithm
+        self.cell_size = cell_size
+        self.tick_rate = tick_rate
+        self.fixed_layout = bool(flags & REPLAY_FIXED_LAYOUT)
+        self.endless = bool(flags & REPLAY_ENDLESS)
+        self.swarm = bool(flags & REPLAY_SWARM)
+        self.rounds = []
+
+def load_replay(path):
+    # Raises ValueError for anything that is not a complete recording
+    with open(path, "rb") as handle:
+        data = handle.read()
+    if len(data) < REPLAY_FILE_HEADER.size or data[:4] != REPLAY_FILE_MAGIC:
+        raise ValueError(f"{path} is not an input recording")
+    magic, version, flags, num_monsters, num_rows, num_cols, cell_size, tick_rate, algorithm = REPLAY_FILE_HEADER.unpack_from(data)
+    if version != REPLAY_FILE_VERSION:
+        raise ValueError(f"{path} has recording format version {version}, expected {REPLAY_FILE_VERSION}")
+    algorithm = algorithm.rstrip(b"\0").decode("ascii")
+    if algorithm not in GENERATORS:
+        raise ValueError(f"{path} was recorded with an unknown maze algorithm '{algorithm}'")
+    replay = Replay(num_rows, num_cols, num_monsters, algorithm, cell_size, tick_rate, flags)
+    offset = REPLAY_FILE_HEADER.size
+    current = None
+    tick = 0
+    try:
+        while offset < len(data):
+            gap, offset = read_varint(data, offset)
+            code = data[offset]
+            offset += 1
+            tick += gap
+            if code == REPLAY_ROUND:
+                if current is not None:
+                    raise ValueError(f"{path} starts a round inside another")
+                current = ReplayRound(*REPLAY_ROUND_SEEDS.unpack_from(data, offset))
+                offset += REPLAY_ROUND_SEEDS.size
+                tick = 0
+            elif current is None:
+                raise ValueError(f"{path} has input outside a round")
+            elif code == REPLAY_END:
+                current.ticks = tick
+                current.outcome = REPLAY_OUTCOMES[data[offset]]
+                offset += 1
+                replay.rounds.append(current)
+                current = None
+            elif code == REPLAY_SOLVE:
+                current.solve_tick = tick
+            elif code in DIRECTION_STEPS:
+                current.moves.setdefault(tick, []).append(code)
+            else:
+                raise ValueError(f"{path} has an unknown record {code}")
+    except (IndexError, struct.error):
+        raise ValueError(f"{path} is truncated")
+    if current is not None:
+        raise ValueError(f"{path} is truncated")
+    return replay
+
 class NodeBorder():
-    def _init_(self, pos_x, pos_y, width, height): # CORRECTED
-        self.color = BLACK
+    # View over a single wall bit of a cell: BLACK while the wall stands, path colour once broken
+    __slots__ = ("maze", "index", "wall", "pos_x", "pos_y", "width", "height")
+
+    def __init__(self, maze, index, wall, pos_x, pos_y, width, height):
+        self.maze = maze
+        self.index = index
+        self.wall = wall
         self.pos_x = pos_x
         self.pos_y = pos_y
         self.width = width
         self.height = height
 
+    @property
+    def color(self):
+        return BLACK if self.maze.walls[self.index] & self.wall else YELLOW
+
+    @color.setter
+    def color(self, value):
+        if value == BLACK:
+            self.maze.walls[self.index] |= self.wall
+        else:
+            self.maze.walls[self.index] &= ALL_WALLS ^ self.wall
+
     def render(self, background):
         pygame.draw.rect(background, self.color, [self.pos_x, self.pos_y, self.width, self.height])
 
 class Node():
-    def _init_(self, screen_pos_x, screen_pos_y): # CORRECTED
-        self.color = DARKGRAY 
-        self.visited = False 
-        self.explored = False
-        self.matrix_pos_x = 0 
-        self.matrix_pos_y = 0 
-        self.pos_x = screen_pos_x
-        self.pos_y = screen_pos_y
-        self.width = SIZE
-        self.height = SIZE
-        # Ensure NodeBorder is called with its correct _init_ parameters
-        self.top_border = NodeBorder(self.pos_x, self.pos_y, SIZE, BORDER_THICKNESS)
-        self.bottom_border = NodeBorder(self.pos_x, self.pos_y + SIZE - BORDER_THICKNESS, SIZE, BORDER_THICKNESS)
-        self.right_border = NodeBorder(self.pos_x + SIZE - BORDER_THICKNESS, self.pos_y, BORDER_THICKNESS, SIZE)
-        self.left_border = NodeBorder(self.pos_x, self.pos_y, BORDER_THICKNESS, SIZE)
-        self.neighbors = []
-        self.neighbors_connected = [] 
-        self.parent = None 
-        self.special_icon = None 
+    # Lightweight view over one cell of a Maze; all state lives in the maze's flat arrays
+    __slots__ = ("maze", "index", "matrix_pos_x", "matrix_pos_y")
+
+    def __init__(self, maze, row, col):
+        self.maze = maze
+        self.index = row * maze.num_cols + col
+        self.matrix_pos_x = row
+        self.matrix_pos_y = col
+
+    def __eq__(self, other):
+        return isinstance(other, Node) and other.maze is self.maze and other.index == self.index
+
+    def __hash__(self):
+        return hash((id(self.maze), self.index))
+
+    @property
+    def pos_x(self): return self.matrix_pos_y * self.maze.cell_size
+
+    @property
+    def pos_y(self): return self.matrix_pos_x * self.maze.cell_size
+
+    @property
+    def width(self): return self.maze.cell_size
+
+    @property
+    def height(self): return self.maze.cell_size
+
+    @property
+    def color(self):
+        return STATE_COLORS[self.maze.cell_state[self.index]]
+
+    @color.setter
+    def color(self, value):
+        self.maze.cell_state[self.index] = COLOR_TO_STATE.get(value, STATE_UNVISITED)
+
+    @property
+    def visited(self):
+        return bool(self.maze.flags[self.index] & FLAG_VISITED)
+
+    @visited.setter
+    def visited(self, value):
+        if value: self.maze.flags[self.index] |= FLAG_VISITED
+        else: self.maze.flags[self.index] &= ~FLAG_VISITED & 0xFF
+
+    @property
+    def explored(self):
+        return bool(self.maze.flags[self.index] & FLAG_EXPLORED)
+
+    @explored.setter
+    def explored(self, value):
+        if value: self.maze.flags[self.index] |= FLAG_EXPLORED
+        else: self.maze.flags[self.index] &= ~FLAG_EXPLORED & 0xFF
+
+    @property
+    def parent(self):
+        parents = self.maze.parent
+        if parents is None or parents[self.index] < 0:
+            return None
+        return self.maze.node_at(parents[self.index])
+
+    @parent.setter
+    def parent(self, node):
+        if self.maze.parent is None:
+            if node is None: return
+            self.maze.parent = array('i', [-1]) * self.maze.total_nodes
+        self.maze.parent[self.index] = -1 if node is None else node.index
+
+    @property
+    def special_icon(self):
+        return self.maze.special_icons.get(self.index)
+
+    @special_icon.setter
+    def special_icon(self, icon):
+        if icon is None: self.maze.special_icons.pop(self.index, None)
+        else: self.maze.special_icons[self.index] = icon
+
+    @property
+    def top_border(self):
+        size = self.maze.cell_size
+        return NodeBorder(self.maze, self.index, WALL_TOP, self.pos_x, self.pos_y, size, BORDER_THICKNESS)
+
+    @property
+    def bottom_border(self):
+        size = self.maze.cell_size
+        return NodeBorder(self.maze, self.index, WALL_BOTTOM, self.pos_x, self.pos_y + size - BORDER_THICKNESS, size, BORDER_THICKNESS)
+
+    @property
+    def right_border(self):
+        size = self.maze.cell_size
+        return NodeBorder(self.maze, self.index, WALL_RIGHT, self.pos_x + size - BORDER_THICKNESS, self.pos_y, BORDER_THICKNESS, size)
+
+    @property
+    def left_border(self):
+        size = self.maze.cell_size
+        return NodeBorder(self.maze, self.index, WALL_LEFT, self.pos_x, self.pos_y, BORDER_THICKNESS, size)
+
+    @property
+    def neighbors(self):
+        return [self.maze.node_at(i) for i, _ in self.maze.adjacent_cells(self.index)]
+
+    @property
+    def neighbors_connected(self):
+        return [self.maze.node_at(i) for i in self.maze.open_neighbors(self.index)]
 
     def render(self, background):
-        pygame.draw.rect(background, self.color, [self.pos_x, self.pos_y, self.width, self.height])
-        if self.special_icon:
-            icon_x = self.pos_x + (self.width - self.special_icon.get_width()) // 2
-            icon_y = self.pos_y + (self.height - self.special_icon.get_height()) // 2
-            background.blit(self.special_icon, (icon_x, icon_y))
-        self.top_border.render(background)
-        self.bottom_border.render(background)
-        self.right_border.render(background)
-        self.left_border.render(background)
+        self.maze.render_cell(background, self.index)
+
+class NodeRow():
+    __slots__ = ("maze", "row")
+
+    def __init__(self, maze, row):
+        self.maze = maze
+        self.row = row
+
+    def __len__(self):
+        return self.maze.num_cols
+
+    def __getitem__(self, col):
+        if col < 0: col += self.maze.num_cols
+        if not 0 <= col < self.maze.num_cols:
+            raise IndexError("maze column out of range")
+        return Node(self.maze, self.row, col)
+
+    def __iter__(self):
+        for col in range(self.maze.num_cols):
+            yield Node(self.maze, self.row, col)
+
+class NodeGrid():
+    # Keeps the old maze.maze[row][col] access pattern working on top of the flat arrays
+    __slots__ = ("maze",)
+
+    def __init__(self, maze):
+        self.maze = maze
+
+    def __len__(self):
+        return self.maze.num_rows
+
+    def __getitem__(self, row):
+        if row < 0: row += self.maze.num_rows
+        if not 0 <= row < self.maze.num_rows:
+            raise IndexError("maze row out of range")
+        return NodeRow(self.maze, row)
+
+    def __iter__(self):
+        for row in range(self.maze.num_rows):
+            yield NodeRow(self.maze, row)
+
+class Camera():
+    # Window onto the maze in world pixels, centred on a followed cell and clamped to the maze edges
+    def __init__(self, view_width, view_height, num_rows, num_cols, cell_size=SIZE):
+        self.view_width = view_width
+        self.view_height = view_height
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self.cell_size = cell_size
+        self.world_width = num_cols * cell_size
+        self.world_height = num_rows * cell_size
+        self.offset_x = 0
+        self.offset_y = 0
+        self.target_x = self.target_y = 0 # Offset follow() last asked for
+        self.previous_x = self.previous_y = 0 # Target at the start of the current tick, for interpolate()
+
+    @property
+    def rect(self):
+        return pygame.Rect(0, 0, self.view_width, self.view_height)
+
+    def follow(self, row, col):
+        # Moves the view there at once; returns True when it scrolled
+        target_x = col * self.cell_size + self.cell_size // 2 - self.view_width // 2
+        target_y = row * self.cell_size + self.cell_size // 2 - self.view_height // 2
+        offset_x = max(0, min(target_x, self.world_width - self.view_width))
+        offset_y = max(0, min(target_y, self.world_height - self.view_height))
+        moved = offset_x != self.offset_x or offset_y != self.offset_y
+        self.offset_x, self.offset_y = self.target_x, self.target_y = offset_x, offset_y
+        return moved
+
+    def snap(self):
+        # As CellSprite.snap: at the start of every tick, and after a jump the view should not glide across
+        self.previous_x, self.previous_y = self.target_x, self.target_y
+
+    def interpolate(self, alpha):
+        # Places the view between the last two ticks' targets with the same alpha and rounding as the sprites,
+        # so a followed sprite stays put on screen instead of the view catching up with it once per tick
+        self.offset_x = round(self.previous_x + (self.target_x - self.previous_x) * alpha)
+        self.offset_y = round(self.previous_y + (self.target_y - self.previous_y) * alpha)
+
+    def visible_cells(self):
+        # Half-open (first_row, last_row, first_col, last_col) range of cells inside the view
+        first_row = self.offset_y // self.cell_size
+        first_col = self.offset_x // self.cell_size
+        last_row = min(self.num_rows, (self.offset_y + self.view_height + self.cell_size - 1) // self.cell_size)
+        last_col = min(self.num_cols, (self.offset_x + self.view_width + self.cell_size - 1) // self.cell_size)
+        return first_row, last_row, first_col, last_col
+
+    def to_screen(self, pos_x, pos_y):
+        return pos_x - self.offset_x, pos_y - self.offset_y
+
+class SimulationClock():
+    # Fixed-timestep accumulator: real (or scaled) elapsed time goes in, a whole number of ticks to simulate
+    # comes out, and alpha says how far rendering is between the last two ticks
+    def __init__(self, tick_rate=TICK_RATE, max_ticks_per_frame=MAX_TICKS_PER_FRAME, speed=1.0):
+        self.tick_seconds = 1.0 / tick_rate
+        self.max_ticks_per_frame = max_ticks_per_frame
+        self.speed = speed
+        self.accumulator = 0.0
+        self.ticks = 0
+
+    def reset(self):
+        self.accumulator = 0.0
+
+    def advance(self, elapsed_seconds):
+        self.accumulator += elapsed_seconds * self.speed
+        ticks = int(self.accumulator / self.tick_seconds)
+        if ticks > self.max_ticks_per_frame:
+            # After a long stall, drop the backlog instead of freezing to catch up
+            ticks = self.max_ticks_per_frame
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= ticks * self.tick_seconds
+        self.ticks += ticks
+        return ticks
+
+    @property
+    def alpha(self):
+        return min(1.0, self.accumulator / self.tick_seconds)
+
+class FrameProfiler():
+    # Per-frame wall time of each phase of the game loop, as rolling p50/p95/p99 and optionally a full trace.
+    # While disabled every call returns straight away, so the hooks can stay in the hot path.
+    def __init__(self, window=PROFILE_WINDOW):
+        self.enabled = False
+        self.recording = False # Keep every frame for dump(), not just the rolling window
+        self.samples = {phase: deque(maxlen=window) for phase in PROFILE_PHASES + ("total",)}
+        self.trace = []
+        self.current = {}
+        self.frame_start = self.last_mark = 0.0
+        self.frames = 0
+        self.overlay = None # Rendered table, rebuilt every PROFILE_REFRESH frames
+        self.overlay_frame = -PROFILE_REFRESH
+
+    def start_frame(self):
+        if not self.enabled: return
+        self.current = dict.fromkeys(PROFILE_PHASES, 0.0)
+        self.frame_start = self.last_mark = time.perf_counter()
+
+    def mark(self, phase):
+        # Charges the time since the previous mark to phase; ignored outside start_frame/end_frame
+        if not self.enabled or not self.current: return
+        now = time.perf_counter()
+        self.current[phase] += (now - self.last_mark) * 1000
+        self.last_mark = now
+
+    def end_frame(self):
+        if not self.enabled or not self.current: return
+        self.current["total"] = (time.perf_counter() - self.frame_start) * 1000
+        for phase, milliseconds in self.current.items():
+            self.samples[phase].append(milliseconds)
+        if self.recording:
+            self.trace.append((self.frames, *(self.current[phase] for phase in PROFILE_PHASES + ("total",))))
+        self.frames += 1
+        self.current = {}
+
+    def percentiles(self, phase):
+        # (p50, p95, p99) in milliseconds over the rolling window
+        samples = sorted(self.samples[phase])
+        if not samples:
+            return 0.0, 0.0, 0.0
+        last = len(samples) - 1
+        return tuple(samples[round(last * fraction)] for fraction in (0.50, 0.95, 0.99))
+
+    def summary(self):
+        return {phase: dict(zip(("p50", "p95", "p99"), self.percentiles(phase))) for phase in self.samples}
+
+    def dump(self, path):
+        # .json gets the percentile summary and every recorded frame; anything else is written as CSV frames
+        columns = ("frame",) + PROFILE_PHASES + ("total",)
+        with open(path, "w", newline="") as handle:
+            if path.endswith(".json"):
+                json.dump({"summary_ms": self.summary(), "columns": columns, "frames_ms": self.trace}, handle)
+            else:
+                writer = csv.writer(handle)
+                writer.writerow(columns)
+                writer.writerows(self.trace)
+
+    def _build_overlay(self):
+        font = get_font(None, FONTSIZE_MAZE)
+        rows = [("ms", "p50", "p95", "p99")]
+        rows.extend((phase, *(f"{value:.2f}" for value in self.percentiles(phase))) for phase in self.samples)
+        label_width = max(font.size(phase)[0] for phase in self.samples) + 10
+        number_width = font.size("000.00")[0] + 10
+        line_height = font.get_linesize()
+        overlay = pygame.Surface((label_width + 3 * number_width + 10, line_height * len(rows) + 10))
+        overlay.fill(BLACK)
+        for i, row in enumerate(rows):
+            y = 5 + i * line_height
+            # Rendered directly: the numbers change constantly and would only churn the render_text cache
+            overlay.blit(font.render(row[0], True, WHITE), (5, y))
+            for column, value in enumerate(row[1:], 1):
+                value_surface = font.render(value, True, WHITE)
+                overlay.blit(value_surface, (5 + label_width + column * number_width - value_surface.get_width(), y))
+        return overlay
+
+    def render(self, surface, position=(5, 5)):
+        # Returns the rect drawn, for pygame.display.update
+        if self.overlay is None or self.frames - self.overlay_frame >= PROFILE_REFRESH:
+            self.overlay = self._build_overlay()
+            self.overlay_frame = self.frames
+        return surface.blit(self.overlay, position)
+
+PROFILER = FrameProfiler()
+
+class MazeRenderer():
+    # Keeps the visible part of the maze pre-drawn and only repaints the regions sprites moved through
+    def __init__(self, screen, maze, camera):
+        self.screen = screen
+        self.maze = maze
+        self.camera = camera
+        self.view_rect = camera.rect
+        self.background = pygame.Surface(self.view_rect.size).convert()
+        self.background_valid = False
+        self.background_offset = None
+        self.dirty_cells = set()
+        self.sprite_rects = []
+
+    def invalidate(self):
+        # Forces the next draw to rebuild the cached maze and push the whole view
+        self.background_valid = False
+
+    def mark_cell(self, index):
+        # A single cell changed colour or walls; only that cell is redrawn into the cache
+        self.dirty_cells.add(index)
+
+    def _rebuild_background(self):
+        self.background.fill(BLACK)
+        self.maze.render(self.background, self.camera)
+        self.background_valid = True
+        self.background_offset = (self.camera.offset_x, self.camera.offset_y)
+        self.dirty_cells.clear()
+
+    def _redraw_dirty_cells(self):
+        rects = []
+        size = self.maze.cell_size
+        offset_x, offset_y = self.camera.offset_x, self.camera.offset_y
+        first_row, last_row, first_col, last_col = self.camera.visible_cells()
+        self.background.set_clip(self.view_rect)
+        for index in self.dirty_cells:
+            row, col = divmod(index, self.maze.num_cols)
+            if not (first_row <= row < last_row and first_col <= col < last_col):
+                continue # Off screen: the cache is rebuilt from the maze when the view scrolls there
+            self.maze.render_cell(self.background, index, offset_x, offset_y)
+            rects.append(pygame.Rect(col * size - offset_x, row * size - offset_y, size, size))
+        self.background.set_clip(None)
+        self.dirty_cells.clear()
+        return rects
+
+    def draw(self, sprites, alpha=1.0):
+        # Returns the screen rects that changed, ready for pygame.display.update; alpha is the
+        # fraction of the current simulation tick that has elapsed, for sprite interpolation
+        scrolled = self.background_offset != (self.camera.offset_x, self.camera.offset_y)
+        full_redraw = not self.background_valid or scrolled
+        if full_redraw:
+            self._rebuild_background()
+            self.screen.blit(self.background, self.view_rect.topleft)
+            dirty = [self.view_rect]
+        else:
+            dirty = self.sprite_rects + self._redraw_dirty_cells()
+            for rect in dirty:
+                self.screen.blit(self.background, rect, rect)
+        PROFILER.mark("maze")
+
+        self.screen.set_clip(self.view_rect)
+        sprite_rects = []
+        for sprite in sprites:
+            sprite.render(self.screen, self.camera, alpha)
+            sprite_rects.extend(rect.clip(self.view_rect) for rect in sprite.screen_rects(self.camera, alpha))
+        self.screen.set_clip(None)
+        self.sprite_rects = [rect for rect in sprite_rects if rect.width and rect.height]
+        if not full_redraw:
+            dirty.extend(self.sprite_rects)
+        PROFILER.mark("sprites")
+        return dirty
+
+class Minimap():
+    # The whole maze shrunk into the info panel. The picture is built from the wall and state arrays with NumPy
+    # and only rebuilt after invalidate(); the player, goal, monsters and view outline go on top of a copy every
+    # frame it is drawn. Mazes small enough are drawn with their walls, two pixels per cell; larger ones with one
+    # pixel per block of cells, in the block's strongest state colour shaded by how open its cells are.
+    def __init__(self, maze, area=MINIMAP_AREA):
+        self.maze = maze
+        self.area = pygame.Rect(area)
+        self.base = None
+        self.rect = None # Where base is drawn, centred in area with the maze's aspect ratio
+        self.palette = np.array(STATE_COLORS, dtype=np.uint8)
+
+    def invalidate(self):
+        self.base = None
+
+    def _picture(self):
+        # (height, width, 3) colours for the maze, before scaling to the panel
+        maze = self.maze
+        walls = np.frombuffer(maze.walls, dtype=np.uint8).reshape(maze.num_rows, maze.num_cols)
+        states = np.frombuffer(maze.cell_state, dtype=np.uint8).reshape(maze.num_rows, maze.num_cols)
+        if 2 * maze.num_rows + 1 <= self.area.height and 2 * maze.num_cols + 1 <= self.area.width:
+            # Cells on odd pixels, walls between them; a gap takes the weaker state of the two cells it joins
+            grid = np.zeros((2 * maze.num_rows + 1, 2 * maze.num_cols + 1), dtype=np.uint8)
+            is_open = np.zeros(grid.shape, dtype=bool)
+            grid[1::2, 1::2] = states
+            is_open[1::2, 1::2] = True
+            grid[1::2, 2:-1:2] = np.minimum(states[:, :-1], states[:, 1:])
+            is_open[1::2, 2:-1:2] = (walls[:, :-1] & WALL_RIGHT) == 0
+            grid[2:-1:2, 1::2] = np.minimum(states[:-1], states[1:])
+            is_open[2:-1:2, 1::2] = (walls[:-1] & WALL_BOTTOM) == 0
+            picture = self.palette[grid]
+            picture[~is_open] = BLACK
+            return picture
+        block = max(1, int(np.ceil(max(maze.num_rows / self.area.height, maze.num_cols / self.area.width))))
+        rows, cols = -(-maze.num_rows // block), -(-maze.num_cols // block)
+        padded_states = np.zeros((rows * block, cols * block), dtype=np.uint8)
+        padded_states[:maze.num_rows, :maze.num_cols] = states
+        openness = np.zeros((rows * block, cols * block), dtype=np.float32)
+        openness[:maze.num_rows, :maze.num_cols] = np.frombuffer(OPEN_SIDES, dtype=np.uint8)[walls]
+        strongest = padded_states.reshape(rows, block, cols, block).max(axis=(1, 3))
+        shade = 0.6 + 0.1 * openness.reshape(rows, block, cols, block).mean(axis=(1, 3))
+        return (self.palette[strongest] * np.minimum(shade, 1.0)[..., None]).astype(np.uint8)
+
+    def _rebuild(self):
+        picture = self._picture()
+        height, width = picture.shape[:2]
+        scale = min(self.area.width / width, self.area.height / height)
+        size = (max(1, int(width * scale)), max(1, int(height * scale)))
+        surface = pygame.surfarray.make_surface(picture.swapaxes(0, 1))
+        self.base = (pygame.transform.scale if scale >= 1 else pygame.transform.smoothscale)(surface, size)
+        self.rect = self.base.get_rect(center=self.area.center)
+
+    def _pixels(self, cells):
+        # Minimap pixel (x, y) arrays for an array of cell indices
+        rows, cols = np.divmod(np.asarray(cells, dtype=np.int64), self.maze.num_cols)
+        xs = ((cols + 0.5) * self.rect.width / self.maze.num_cols).astype(np.int64)
+        ys = ((rows + 0.5) * self.rect.height / self.maze.num_rows).astype(np.int64)
+        return xs, ys
+
+    def render(self, surface, player=None, goal=None, monsters=(), camera=None):
+        # Draws into surface at area and returns area for pygame.display.update
+        if self.base is None:
+            self._rebuild()
+        frame = self.base.copy()
+        if len(monsters):
+            xs, ys = self._pixels(monsters)
+            pixels = pygame.surfarray.pixels3d(frame)
+            pixels[xs, ys] = MAGENTA
+            del pixels # Unlocks the surface
+        for cell, color in ((goal, BLUE), (player, RED)):
+            if cell is not None and cell >= 0:
+                xs, ys = self._pixels([cell])
+                frame.fill(color, (int(xs[0]) - 1, int(ys[0]) - 1, 3, 3))
+        if camera is not None:
+            first_row, last_row, first_col, last_col = camera.visible_cells()
+            x_scale, y_scale = self.rect.width / self.maze.num_cols, self.rect.height / self.maze.num_rows
+            pygame.draw.rect(frame, WHITE, (int(first_col * x_scale), int(first_row * y_scale),
+                                            max(2, int((last_col - first_col) * x_scale)), max(2, int((last_row - first_row) * y_scale))), 1)
+        surface.fill(BLACK, self.area)
+        surface.blit(frame, self.rect)
+        return self.area
 
 class Maze():
-    def _init_(self, background, initial_x_row, initial_y_col, final_x_row, final_y_col, start_cell_icon=None, finish_cell_icon=None): # CORRECTED
+    def __init__(self, background, initial_x_row, initial_y_col, final_x_row, final_y_col, start_cell_icon=None, finish_cell_icon=None,
+                 num_rows=None, num_cols=None, cell_size=SIZE, algorithm=DEFAULT_GENERATOR):
         self.background_surface = background
-        self.maze = []
-        self.total_nodes = 0
         self.maze_created = False
         self.initial_coordinate_x_row = initial_x_row
         self.initial_coordinate_y_col = initial_y_col
         self.final_coordinate_x_row = final_x_row
         self.final_coordinate_y_col = final_y_col
-        self.num_rows = HEIGHT // SIZE
-        self.num_cols = WIDTH // SIZE
-
-        for r_idx in range(self.num_rows):
-            maze_row_list = []
-            for c_idx in range(self.num_cols):
-                current_screen_x = c_idx * SIZE
-                current_screen_y = r_idx * SIZE
-                node = Node(current_screen_x, current_screen_y) # Node needs screen_pos_x, screen_pos_y
-                node.matrix_pos_x = r_idx
-                node.matrix_pos_y = c_idx
-                maze_row_list.append(node)
-                self.total_nodes += 1
-            self.maze.append(maze_row_list)
-        
+        self.cell_size = cell_size
+        self.num_rows = num_rows if num_rows is not None else HEIGHT // cell_size
+        self.num_cols = num_cols if num_cols is not None else WIDTH // cell_size
+        self.total_nodes = self.num_rows * self.num_cols
+        self.algorithm = algorithm
+
+        # One byte per cell for each of: wall bitmask, colour state, visited/explored flags
+        self.walls = array('B', [ALL_WALLS]) * self.total_nodes
+        self.cell_state = array('B', [STATE_UNVISITED]) * self.total_nodes
+        self.flags = bytearray(self.total_nodes)
+        self.parent = None # Allocated on demand by the solver
+        self.last_solve = None
+        self.goal_parent = None # goal_tree towards the finish, built once the maze is carved
+        self.special_icons = {}
+        self.maze = NodeGrid(self)
+
         if start_cell_icon:
-            start_node = self.maze[self.initial_coordinate_x_row][self.initial_coordinate_y_col]
-            start_node.special_icon = start_cell_icon
-            start_node.color = YELLOW 
+            start_index = self.cell_index(self.initial_coordinate_x_row, self.initial_coordinate_y_col)
+            self.special_icons[start_index] = start_cell_icon
+            self.cell_state[start_index] = STATE_PATH
         if finish_cell_icon:
-            finish_node = self.maze[self.final_coordinate_x_row][self.final_coordinate_y_col]
-            finish_node.special_icon = finish_cell_icon
-            finish_node.color = YELLOW
-
-        self.define_neighbors()
-
-    def add_edge(self, node, neighbor):
-        neighbor.neighbors_connected.append(node)
-        node.neighbors_connected.append(neighbor)
-
-    def remove_neighbors_visited(self, node):
-        node.neighbors = [n for n in node.neighbors if not n.visited]
-    
-    def define_neighbors(self):
-        for r in range(self.num_rows):
-            for c in range(self.num_cols):
-                node = self.maze[r][c]
-                node.neighbors = []
-                if r > 0: node.neighbors.append(self.maze[r - 1][c])
-                if r < self.num_rows - 1: node.neighbors.append(self.maze[r + 1][c])
-                if c > 0: node.neighbors.append(self.maze[r][c - 1])
-                if c < self.num_cols - 1: node.neighbors.append(self.maze[r][c + 1])
-                                
-    def break_border(self, node1, node2): 
-        path_color = YELLOW
-        if node2.matrix_pos_y == node1.matrix_pos_y + 1 and node2.matrix_pos_x == node1.matrix_pos_x:
-            node1.right_border.color = path_color
-            node2.left_border.color = path_color
-        elif node2.matrix_pos_y == node1.matrix_pos_y - 1 and node2.matrix_pos_x == node1.matrix_pos_x:
-            node1.left_border.color = path_color
-            node2.right_border.color = path_color
-        elif node2.matrix_pos_x == node1.matrix_pos_x + 1 and node2.matrix_pos_y == node1.matrix_pos_y:
-            node1.bottom_border.color = path_color
-            node2.top_border.color = path_color
-        elif node2.matrix_pos_x == node1.matrix_pos_x - 1 and node2.matrix_pos_y == node1.matrix_pos_y:
-            node1.top_border.color = path_color
-            node2.bottom_border.color = path_color
-    
+            finish_index = self.cell_index(self.final_coordinate_x_row, self.final_coordinate_y_col)
+            self.special_icons[finish_index] = finish_cell_icon
+            self.cell_state[finish_index] = STATE_PATH
+
+    def cell_index(self, row, col):
+        return row * self.num_cols + col
+
+    def node_at(self, index):
+        row, col = divmod(index, self.num_cols)
+        return Node(self, row, col)
+
+    def adjacent_cells(self, index):
+        # (neighbor_index, wall_bit_between) for each in-bounds neighbour
+        row, col = divmod(index, self.num_cols)
+        cells = []
+        if row > 0: cells.append((index - self.num_cols, WALL_TOP))
+        if row < self.num_rows - 1: cells.append((index + self.num_cols, WALL_BOTTOM))
+        if col > 0: cells.append((index - 1, WALL_LEFT))
+        if col < self.num_cols - 1: cells.append((index + 1, WALL_RIGHT))
+        return cells
+
+    def can_move(self, row, col, direction):
+        # direction is a WALL_* bit; a pure bitmask test, independent of what is drawn
+        return not self.walls[row * self.num_cols + col] & direction
+
+    def open_neighbors(self, index):
+        return open_neighbors(self.walls, self.num_cols, index)
+
+    def open_neighbor_cells(self, row, col):
+        # (row, col) of each cell one step away through an open wall
+        return [divmod(index, self.num_cols) for index in open_neighbors(self.walls, self.num_cols, row * self.num_cols + col)]
+
+    def break_border(self, index1, index2):
+        delta = index2 - index1
+        if delta == 1: wall = WALL_RIGHT
+        elif delta == -1: wall = WALL_LEFT
+        elif delta == self.num_cols: wall = WALL_BOTTOM
+        elif delta == -self.num_cols: wall = WALL_TOP
+        else: return
+        self.walls[index1] &= ALL_WALLS ^ wall
+        self.walls[index2] &= ALL_WALLS ^ OPPOSITE_WALL[wall]
+
+    def load_walls(self, walls, goal_parent=None):
+        # Adopts an already carved wall bitmask (e.g. from generate_maze in a worker) instead of running dfs,
+        # and its goal tree when the worker computed one
+        self._reset_maze_state_for_dfs()
+        self.walls[:] = walls
+        self.cell_state[:] = array('B', [STATE_PATH]) * self.total_nodes
+        self.flags[:] = bytes([FLAG_VISITED]) * self.total_nodes
+        self.maze_created = True
+        if goal_parent is not None: self.goal_parent = goal_parent
+        else: self.build_goal_tree()
+
+    def build_goal_tree(self):
+        if 0 <= self.final_coordinate_x_row < self.num_rows and 0 <= self.final_coordinate_y_col < self.num_cols:
+            goal = self.cell_index(self.final_coordinate_x_row, self.final_coordinate_y_col)
+            self.goal_parent = goal_tree(self.walls, self.num_rows, self.num_cols, goal)
+
+    def path_to_goal(self, row, col):
+        # The solution from any cell in O(path), no search
+        goal = self.cell_index(self.final_coordinate_x_row, self.final_coordinate_y_col)
+        return path_to_goal(self.goal_parent, self.cell_index(row, col), goal)
+
     def _reset_maze_state_for_dfs(self):
-        for r_idx in range(self.num_rows):
-            for c_idx in range(self.num_cols):
-                node = self.maze[r_idx][c_idx]
-                node.visited = False
-                node.color = DARKGRAY 
-                node.neighbors_connected = [] 
-                node.parent = None
-                node.explored = False
-                node.top_border.color = BLACK
-                node.bottom_border.color = BLACK
-                node.left_border.color = BLACK
-                node.right_border.color = BLACK
-        self.define_neighbors()
-
-    def dfs(self, background_surface_for_text=None):
-        self._reset_maze_state_for_dfs() 
-        start_row_dfs = random.randint(0, self.num_rows - 1)
-        start_col_dfs = random.randint(0, self.num_cols - 1)
-        current_cell = self.maze[start_row_dfs][start_col_dfs]
-        current_cell.visited = True
-        current_cell.color = YELLOW
-        
-        stack = [current_cell]
-        visited_cells = 1
-        render_counter = 0
-        render_interval = max(1, self.total_nodes // 100 if self.total_nodes > 0 else 1) 
-
-        while visited_cells < self.total_nodes or len(stack) > 0:
-            if not stack:
-                found_unvisited_component = False
-                for r_find in range(self.num_rows):
-                    for c_find in range(self.num_cols):
-                        if not self.maze[r_find][c_find].visited:
-                            current_cell = self.maze[r_find][c_find]
-                            current_cell.visited = True
-                            current_cell.color = YELLOW 
-                            stack.append(current_cell)
-                            visited_cells +=1
-                            found_unvisited_component = True
-                            break
-                    if found_unvisited_component: break
-                if not found_unvisited_component and visited_cells < self.total_nodes:
-                    print("Warning: DFS stack empty but not all cells visited. Maze might have isolated parts.")
-                    break 
-                if not stack: break
-
-            current_cell = stack[-1]
-            self.remove_neighbors_visited(current_cell)
-
-            if len(current_cell.neighbors) > 0:
-                random_neighbor = random.choice(current_cell.neighbors)
-                self.break_border(current_cell, random_neighbor) 
-                self.add_edge(current_cell, random_neighbor) 
-                current_cell = random_neighbor
-                current_cell.visited = True
-                current_cell.color = YELLOW 
-                stack.append(current_cell)
-                visited_cells += 1
-            else: 
-                stack.pop()
-            
-            render_counter += 1
-            if render_counter >= render_interval or not stack: 
-                if background_surface_for_text: 
-                    self.render(background_surface_for_text)
-                    text(background_surface_for_text, "PREPARING YOUR CHALLENGE...", WHITE, FONTSIZE_COMMANDS_INTIAL + 5, coordinate_y=HEIGHT + 40, center=True)
-                    pygame.display.update()
-                render_counter = 0
-        
-        for r_idx in range(self.num_rows):
-            for c_idx in range(self.num_cols):
-                node = self.maze[r_idx][c_idx]
-                if node.visited:
-                    node.color = YELLOW
-                else: 
-                    node.color = DARKGRAY 
-        
-        start_node_final = self.maze[self.initial_coordinate_x_row][self.initial_coordinate_y_col]
-        if start_node_final.special_icon : # It should always be part of path now
-            start_node_final.color = YELLOW
-        
-        finish_node_final = self.maze[self.final_coordinate_x_row][self.final_coordinate_y_col]
-        if finish_node_final.special_icon : # It should always be part of path now
-            finish_node_final.color = YELLOW
+        n = self.total_nodes
+        self.walls[:] = array('B', [ALL_WALLS]) * n
+        self.cell_state[:] = array('B', [STATE_UNVISITED]) * n
+        self.flags[:] = bytes(n)
+        self.parent = None
+        self.goal_parent = None
 
+    def dfs(self, background_surface_for_text=None, camera=None, seed=None):
+        self._reset_maze_state_for_dfs()
+        cell_state, flags = self.cell_state, self.flags
+
+        def show_progress(carved):
+            for index in carved:
+                cell_state[index] = STATE_PATH
+            if background_surface_for_text:
+                self.render(background_surface_for_text, camera)
+                text(background_surface_for_text, "PREPARING YOUR CHALLENGE...", WHITE, FONTSIZE_COMMANDS_INTIAL + 5, coordinate_y=HEIGHT + 40, center=True)
+                pygame.display.update()
+
+        generate_maze(self.num_rows, self.num_cols, seed, walls=self.walls,
+                      progress=show_progress if background_surface_for_text else None, algorithm=self.algorithm)
+        # Every cell is carved once generation finishes
+        cell_state[:] = array('B', [STATE_PATH]) * self.total_nodes
+        flags[:] = bytes([FLAG_VISITED]) * self.total_nodes
         self.maze_created = True
+        self.build_goal_tree()
         if background_surface_for_text:
-            self.render(background_surface_for_text)
+            self.render(background_surface_for_text, camera)
             pygame.display.update()
 
-    def bfs(self, background, player):
-        for r_idx in range(self.num_rows):
-            for c_idx in range(self.num_cols):
-                node = self.maze[r_idx][c_idx]
-                node.explored = False
-                node.parent = None
-                if node.color == PINK or node.color == ORANGE:
-                    if not node.special_icon: 
-                        node.color = YELLOW 
-                    elif node.color != YELLOW: 
-                        node.color = YELLOW
-
-        initial_node = self.maze[player.matrix_pos_x_row][player.matrix_pos_y_col]
-        initial_node.explored = True
-        find = False
-        queue = [initial_node]
-        temp_bfs_colors = {} 
-
-        while len(queue) > 0 and not find:
-            u = queue.pop(0)
-            if not u.special_icon and u != initial_node:
-                 temp_bfs_colors[(u.matrix_pos_x, u.matrix_pos_y)] = PINK
-            
-            for neighbor_node in u.neighbors_connected:
-                if not neighbor_node.explored:
-                    neighbor_node.parent = u
-                    neighbor_node.explored = True
-                    queue.append(neighbor_node)
-                    if neighbor_node.matrix_pos_x == self.final_coordinate_x_row and \
-                       neighbor_node.matrix_pos_y == self.final_coordinate_y_col:
-                        find = True
-                        break
-            if find: break
-            
-            original_node_colors_backup = {} 
-            for (r_bfs, c_bfs), temp_color in temp_bfs_colors.items():
-                node_to_color = self.maze[r_bfs][c_bfs]
-                original_node_colors_backup[(r_bfs, c_bfs)] = node_to_color.color
-                if not node_to_color.special_icon and node_to_color != initial_node: 
-                    node_to_color.color = temp_color
-            
-            self.render(background)
-            
-            for (r_bfs, c_bfs), original_color in original_node_colors_backup.items(): 
-                self.maze[r_bfs][c_bfs].color = original_color
+    def _reset_solver_state(self):
+        # Only the colours of the last solution are cleared; pathing itself never looks at them
+        self.flags[:] = self.flags.translate(CLEAR_EXPLORED)
+        self.cell_state[:] = array('B', self.cell_state.tobytes().translate(SOLVER_STATES_TO_PATH))
+        self.parent = None
 
-            text(background, "SYSTEM SOLVING...", WHITE, FONTSIZE_COMMANDS_INTIAL + 5, coordinate_y=HEIGHT + 40, center=True)
-            player.render(background)
-            pygame.display.update()
-            pygame.time.wait(10)
-
-        if find:
-            path_node = self.maze[self.final_coordinate_x_row][self.final_coordinate_y_col]
-            while path_node.parent is not None and path_node != initial_node:
-                if path_node != self.maze[self.final_coordinate_x_row][self.final_coordinate_y_col] and \
-                   path_node != initial_node and not path_node.special_icon:
-                    path_node.color = ORANGE
-                path_node = path_node.parent
-                
-                self.render(background)
-                player.render(background)
+    def bfs(self, background, player, camera=None, frame_budget=SOLVE_FRAMES, solver=DEFAULT_SOLVER):
+        # Solves with the named SOLVERS entry first, then optionally replays the search; returns the path as
+        # cell indices. last_solve keeps (solver, cells expanded, seconds) for the info panel.
+        self._reset_solver_state()
+        start = self.cell_index(player.matrix_pos_x_row, player.matrix_pos_y_col)
+        goal = self.cell_index(self.final_coordinate_x_row, self.final_coordinate_y_col)
+        if solver == GOAL_TREE_SOLVER:
+            started = time.perf_counter()
+            if self.goal_parent is None: self.build_goal_tree()
+            path = visit_order = path_to_goal(self.goal_parent, start, goal)
+            seconds = time.perf_counter() - started
+        else:
+            path, visit_order, seconds = run_solver(solver, self.walls, self.num_rows, self.num_cols, start, goal)
+        self.last_solve = (solver, len(visit_order), seconds)
+        animate = background is not None and frame_budget > 0
+
+        if animate:
+            cell_state = self.cell_state
+            explored = [index for index in visit_order if index != start and index not in self.special_icons]
+            step = max(1, -(-len(explored) // frame_budget))
+            for first in range(0, len(explored), step):
+                for index in explored[first:first + step]:
+                    cell_state[index] = STATE_EXPLORED
+                self.render(background, camera)
+                text(background, "SYSTEM SOLVING...", WHITE, FONTSIZE_COMMANDS_INTIAL + 5, coordinate_y=HEIGHT + 40, center=True)
+                player.render(background, camera)
+                pygame.display.update()
+                pygame.time.wait(10)
+            for index in explored:
+                cell_state[index] = STATE_PATH
+
+        if not path:
+            if background is not None:
+                text(background, "NO PATH FOUND (ERROR?)", RED, FONTSIZE_COMMANDS_INTIAL + 5, coordinate_y=HEIGHT + 40, center=True)
+                pygame.display.update()
+                pygame.time.wait(1000)
+            return path
+
+        # Revealed from the goal back towards the player, as before
+        solution = [index for index in reversed(path[1:-1]) if index not in self.special_icons]
+        step = max(1, -(-len(solution) // frame_budget)) if animate else len(solution) or 1
+        for first in range(0, len(solution), step):
+            for index in solution[first:first + step]:
+                self.cell_state[index] = STATE_SOLUTION
+            if animate:
+                self.render(background, camera)
+                player.render(background, camera)
                 text(background, "PATH REVEALED!", ORANGE, FONTSIZE_COMMANDS_INTIAL + 5, coordinate_y=HEIGHT + 40, center=True)
                 pygame.display.update()
                 pygame.time.wait(35)
+        return path
+
+    def render_cell(self, background, index, offset_x=0, offset_y=0):
+        size = self.cell_size
+        row, col = divmod(index, self.num_cols)
+        pos_x, pos_y = col * size - offset_x, row * size - offset_y
+        walls = self.walls[index]
+        atlas, areas = ASSETS.wall_atlas(size)
+        background.blit(atlas, (pos_x, pos_y), areas[self.cell_state[index] << 4 | walls])
+        special_icon = self.special_icons.get(index)
+        if special_icon:
+            # The walls go over the icon, as on every other cell
+            icon_x = pos_x + (size - special_icon.get_width()) // 2
+            icon_y = pos_y + (size - special_icon.get_height()) // 2
+            background.blit(special_icon, (icon_x, icon_y))
+            draw_cell_walls(background, walls, pos_x, pos_y, size)
+
+    def render(self, background, camera=None):
+        # One blits call over atlas tiles for the whole area; only the cells with an icon are drawn on their own
+        if camera is None:
+            first_row, last_row, first_col, last_col = 0, self.num_rows, 0, self.num_cols
+            offset_x = offset_y = 0
         else:
-            text(background, "NO PATH FOUND (ERROR?)", RED, FONTSIZE_COMMANDS_INTIAL + 5, coordinate_y=HEIGHT + 40, center=True)
+            # Only the cells inside the viewport, clipped so partial edge cells stay out of the info panel
+            first_row, last_row, first_col, last_col = camera.visible_cells()
+            offset_x, offset_y = camera.offset_x, camera.offset_y
+            previous_clip = background.get_clip()
+            background.set_clip(camera.rect)
+        size = self.cell_size
+        atlas, areas = ASSETS.wall_atlas(size)
+        walls, cell_state = self.walls, self.cell_state
+        xs = range(first_col * size - offset_x, last_col * size - offset_x, size)
+        tiles = []
+        for row in range(first_row, last_row):
+            row_start = row * self.num_cols
+            pos_y = row * size - offset_y
+            tiles.extend((atlas, (pos_x, pos_y), areas[state << 4 | cell_walls]) for pos_x, state, cell_walls
+                         in zip(xs, cell_state[row_start + first_col:row_start + last_col], walls[row_start + first_col:row_start + last_col]))
+        background.blits(tiles, doreturn=False)
+        for index in self.special_icons:
+            row, col = divmod(index, self.num_cols)
+            if first_row <= row < last_row and first_col <= col < last_col:
+                self.render_cell(background, index, offset_x, offset_y)
+        if camera is not None:
+            background.set_clip(previous_clip)
+
+class EndlessMaze(Maze):
+    # A fixed window of num_rows rows over a maze that never ends downwards. New rows come from an EllerRows
+    # stream as the window advances, so memory stays O(num_rows * num_cols) however deep the player goes.
+    def __init__(self, background, initial_x_row, initial_y_col, start_cell_icon=None, num_rows=None, num_cols=None, cell_size=SIZE):
+        super().__init__(background, initial_x_row, initial_y_col, -1, -1, start_cell_icon=start_cell_icon,
+                         num_rows=num_rows, num_cols=num_cols, cell_size=cell_size, algorithm="eller")
+        self.row_offset = 0 # Depth of the window's first row
+        self.rows = None
+
+    def dfs(self, background_surface_for_text=None, camera=None, seed=None):
+        self._reset_maze_state_for_dfs()
+        self.rows = EllerRows(self.num_cols, random.Random(seed))
+        self.row_offset = 0
+        for row in range(self.num_rows):
+            self.walls[row * self.num_cols:(row + 1) * self.num_cols] = self.rows.next_row()
+        self._seal_bottom_row(True)
+        self.cell_state[:] = array('B', [STATE_PATH]) * self.total_nodes
+        self.flags[:] = bytes([FLAG_VISITED]) * self.total_nodes
+        self.maze_created = True
+        if background_surface_for_text:
+            self.render(background_surface_for_text, camera)
             pygame.display.update()
-            pygame.time.wait(1000)
 
-    def render(self, background):
-        for r_idx in range(self.num_rows):
-            for c_idx in range(self.num_cols):
-                self.maze[r_idx][c_idx].render(background)
+    def advance(self, num_rows):
+        # Drops num_rows rows off the top and streams the same number in at the bottom
+        num_rows = min(num_rows, self.num_rows)
+        dropped = num_rows * self.num_cols
+        self._seal_bottom_row(False)
+        del self.walls[:dropped]
+        del self.cell_state[:dropped]
+        del self.flags[:dropped]
+        for _ in range(num_rows):
+            self.walls.extend(self.rows.next_row())
+        self._seal_bottom_row(True)
+        self.cell_state.extend(array('B', [STATE_PATH]) * dropped)
+        self.flags.extend(bytes([FLAG_VISITED]) * dropped)
+        # The new top row may still open into discarded rows
+        for col in range(self.num_cols):
+            self.walls[col] |= WALL_TOP
+        self.special_icons = {index - dropped: icon for index, icon in self.special_icons.items() if index >= dropped}
+        self.parent = None
+        self.row_offset += num_rows
+
+    def _seal_bottom_row(self, sealed):
+        # The bottom row's downward openings lead into rows not streamed yet; they stay walled off until then,
+        # so the window is always a closed grid for the solvers
+        base = (self.num_rows - 1) * self.num_cols
+        for col in range(self.num_cols):
+            if self.rows.open_above[col]:
+                if sealed: self.walls[base + col] |= WALL_BOTTOM
+                else: self.walls[base + col] &= ALL_WALLS ^ WALL_BOTTOM
 
-class Player():
-    def _init_(self, initial_x_row, initial_y_col, image_path="assets/player.png"): # CORRECTED
+class CellSprite():
+    # Shared by Player and Monster: pixel position of the sprite centred in its cell, plus the position at the
+    # start of the current simulation tick so rendering can interpolate between the two
+    def _recalculate_screen_pos(self):
+        self.pos_x = self.matrix_pos_y_col * self.cell_size + (self.cell_size - self.image_width) // 2
+        self.pos_y = self.matrix_pos_x_row * self.cell_size + (self.cell_size - self.image_height) // 2
+
+    def snap(self):
+        # Called at the start of every tick, and after a teleport so the sprite does not glide across the maze
+        self.prev_pos_x, self.prev_pos_y = self.pos_x, self.pos_y
+
+    def move_to(self, row, col):
+        if (row, col) != (self.matrix_pos_x_row, self.matrix_pos_y_col):
+            self.matrix_pos_x_row, self.matrix_pos_y_col = row, col
+            self._recalculate_screen_pos()
+
+    def draw_pos(self, camera=None, alpha=1.0):
+        pos_x = round(self.prev_pos_x + (self.pos_x - self.prev_pos_x) * alpha)
+        pos_y = round(self.prev_pos_y + (self.pos_y - self.prev_pos_y) * alpha)
+        return camera.to_screen(pos_x, pos_y) if camera else (pos_x, pos_y)
+
+KEY_DIRECTIONS = {pygame.K_UP: WALL_TOP, pygame.K_RIGHT: WALL_RIGHT, pygame.K_DOWN: WALL_BOTTOM, pygame.K_LEFT: WALL_LEFT}
+DIRECTION_KEYS = {direction: key for key, direction in KEY_DIRECTIONS.items()} # Replays turn recorded moves back into key presses
+
+class Player(CellSprite):
+    def __init__(self, initial_x_row, initial_y_col, image_path="assets/player.png", num_rows=None, num_cols=None, cell_size=SIZE):
         self.matrix_pos_x_row = initial_x_row
         self.matrix_pos_y_col = initial_y_col
+        self.cell_size = cell_size
+        self.num_rows = num_rows if num_rows is not None else HEIGHT // cell_size
+        self.num_cols = num_cols if num_cols is not None else WIDTH // cell_size
         max_dim_scale = 0.8
-        max_width = int(SIZE * max_dim_scale)
-        max_height = int(SIZE * max_dim_scale)
-        self.original_image = None 
-        try:
-            loaded_image = pygame.image.load(image_path).convert_alpha()
-            self.original_image = loaded_image 
-            original_width, original_height = loaded_image.get_size()
-            if original_height == 0: aspect_ratio = 1
-            else: aspect_ratio = original_width / float(original_height)
-            if original_width > original_height:
-                self.image_width = max_width
-                self.image_height = int(self.image_width / aspect_ratio) if aspect_ratio != 0 else max_height
-                if self.image_height > max_height:
-                    self.image_height = max_height
-                    self.image_width = int(self.image_height * aspect_ratio)
-            else:
-                self.image_height = max_height
-                self.image_width = int(self.image_height * aspect_ratio)
-                if self.image_width > max_width:
-                    self.image_width = max_width
-                    self.image_height = int(self.image_width / aspect_ratio) if aspect_ratio != 0 else max_height
-            self.image_width = max(1, self.image_width)
-            self.image_height = max(1, self.image_height)
-            self.image = pygame.transform.smoothscale(loaded_image, (self.image_width, self.image_height))
-        except pygame.error as e:
-            print(f"Error: Could not load player image at '{image_path}': {e}")
-            self.image = None
+        max_size = int(cell_size * max_dim_scale)
+        self.original_image = ASSETS.load(image_path)
+        self.image = ASSETS.fit(image_path, max_size, max_size)
+        if self.image:
+            self.image_width, self.image_height = self.image.get_size()
+        else:
             self.fallback_color = RED
-            self.image_width = int(SIZE * max_dim_scale) 
-            self.image_height = int(SIZE * max_dim_scale)
+            self.image_width = self.image_height = max_size
         self._recalculate_screen_pos()
+        self.snap()
 
-    def _recalculate_screen_pos(self):
-        self.pos_x = self.matrix_pos_y_col * SIZE + (SIZE - self.image_width) // 2
-        self.pos_y = self.matrix_pos_x_row * SIZE + (SIZE - self.image_height) // 2
-
-    def update(self, maze_grid_nodes, events):
+    def update(self, maze, events):
         moved = False
         for event in events:
-            if event.type == pygame.KEYDOWN:
-                current_node = maze_grid_nodes[self.matrix_pos_x_row][self.matrix_pos_y_col]
-                if event.key == pygame.K_LEFT and self.matrix_pos_y_col > 0 and \
-                   (current_node.left_border.color != BLACK):
-                    self.matrix_pos_y_col -= 1; moved = True
-                elif event.key == pygame.K_RIGHT and self.matrix_pos_y_col < (WIDTH // SIZE) - 1 and \
-                     (current_node.right_border.color != BLACK):
-                    self.matrix_pos_y_col += 1; moved = True
-                elif event.key == pygame.K_UP and self.matrix_pos_x_row > 0 and \
-                     (current_node.top_border.color != BLACK):
-                    self.matrix_pos_x_row -= 1; moved = True
-                elif event.key == pygame.K_DOWN and self.matrix_pos_x_row < (HEIGHT // SIZE) - 1 and \
-                     (current_node.bottom_border.color != BLACK):
-                    self.matrix_pos_x_row += 1; moved = True
+            if event.type == pygame.KEYDOWN and event.key in KEY_DIRECTIONS:
+                direction = KEY_DIRECTIONS[event.key]
+                if maze.can_move(self.matrix_pos_x_row, self.matrix_pos_y_col, direction):
+                    row_step, col_step = DIRECTION_STEPS[direction]
+                    self.matrix_pos_x_row += row_step
+                    self.matrix_pos_y_col += col_step
+                    moved = True
         if moved:
             self._recalculate_screen_pos()
 
-    def render(self, background):
+    def screen_rects(self, camera=None, alpha=1.0):
+        return [pygame.Rect(self.draw_pos(camera, alpha), (self.image_width, self.image_height))]
+
+    def render(self, background, camera=None, alpha=1.0):
+        pos_x, pos_y = self.draw_pos(camera, alpha)
         if self.image:
-            background.blit(self.image, (self.pos_x, self.pos_y))
+            background.blit(self.image, (pos_x, pos_y))
         elif hasattr(self, 'fallback_color'):
-            fallback_rect_pos_x = self.pos_x
-            fallback_rect_pos_y = self.pos_y
+            fallback_rect_pos_x = pos_x
+            fallback_rect_pos_y = pos_y
             pygame.draw.rect(background, self.fallback_color, 
                              [fallback_rect_pos_x, fallback_rect_pos_y, self.image_width, self.image_height])
 
-class Monster():
-    def _init_(self, start_row, start_col, image_path="assets/monster.png", move_delay=30): # CORRECTED
+class Monster(CellSprite):
+    def __init__(self, start_row, start_col, image_path="assets/monster.png", move_delay=30, num_rows=None, num_cols=None, cell_size=SIZE,
+                 rng=random):
         self.matrix_pos_x_row = start_row
         self.matrix_pos_y_col = start_col
+        self.cell_size = cell_size
+        self.num_rows = num_rows if num_rows is not None else HEIGHT // cell_size
+        self.num_cols = num_cols if num_cols is not None else WIDTH // cell_size
         max_dim_scale = 0.8
-        max_width = int(SIZE * max_dim_scale)
-        max_height = int(SIZE * max_dim_scale)
-        try:
-            original_image = pygame.image.load(image_path).convert_alpha()
-            original_width, original_height = original_image.get_size()
-            if original_height == 0: aspect_ratio = 1
-            else: aspect_ratio = original_width / float(original_height)
-            if original_width > original_height:
-                self.image_width = max_width
-                self.image_height = int(self.image_width / aspect_ratio) if aspect_ratio != 0 else max_height
-                if self.image_height > max_height:
-                    self.image_height = max_height
-                    self.image_width = int(self.image_height * aspect_ratio)
-            else:
-                self.image_height = max_height
-                self.image_width = int(self.image_height * aspect_ratio)
-                if self.image_width > max_width:
-                    self.image_width = max_width
-                    self.image_height = int(self.image_width / aspect_ratio) if aspect_ratio != 0 else max_height
-            self.image_width = max(1, self.image_width)
-            self.image_height = max(1, self.image_height)
-            self.image = pygame.transform.smoothscale(original_image, (self.image_width, self.image_height))
-        except pygame.error as e:
-            print(f"Error: Could not load monster image at '{image_path}': {e}")
-            self.image = None
-            self.image_width = int(SIZE * max_dim_scale) 
-            self.image_height = int(SIZE * max_dim_scale)
+        max_size = int(cell_size * max_dim_scale)
+        self.image = ASSETS.fit(image_path, max_size, max_size)
+        if self.image:
+            self.image_width, self.image_height = self.image.get_size()
+        else:
+            self.image_width = self.image_height = max_size
         self.move_timer = 0
-        self.move_delay = move_delay
+        self.move_delay = move_delay # In simulation ticks
+        self.rng = rng # Breaks ties between equally good moves
         self._recalculate_screen_pos()
+        self.snap()
 
-    def _recalculate_screen_pos(self):
-        self.pos_x = self.matrix_pos_y_col * SIZE + (SIZE - self.image_width) // 2
-        self.pos_y = self.matrix_pos_x_row * SIZE + (SIZE - self.image_height) // 2
+    def screen_rects(self, camera=None, alpha=1.0):
+        if not self.image:
+            return []
+        return [pygame.Rect(self.draw_pos(camera, alpha), (self.image_width, self.image_height))]
 
-    def render(self, background):
+    def render(self, background, camera=None, alpha=1.0):
         if self.image:
-            background.blit(self.image, (self.pos_x, self.pos_y))
+            background.blit(self.image, self.draw_pos(camera, alpha))
 
-    def update(self, player, maze_nodes):
+    def update(self, player, maze, distance_field=None):
+        # With a distance-to-player field the monster steps to the open neighbour closest to the player
+        # by maze distance; without one (or off the field) it falls back to the Manhattan-greedy chase
         self.move_timer += 1
         if self.move_timer < self.move_delay:
             return 
         self.move_timer = 0
+        if distance_field is not None and self._follow_field(maze, distance_field):
+            return
         possible_moves = []
-        current_r, current_c = self.matrix_pos_x_row, self.matrix_pos_y_col
-        current_node = maze_nodes[current_r][current_c]
-        if not current_node.neighbors_connected:
-            return 
-        for neighbor_node in current_node.neighbors_connected:
-            nr, nc = neighbor_node.matrix_pos_x, neighbor_node.matrix_pos_y
+        for nr, nc in maze.open_neighbor_cells(self.matrix_pos_x_row, self.matrix_pos_y_col):
             dist_to_player = abs(nr - player.matrix_pos_x_row) + abs(nc - player.matrix_pos_y_col)
             possible_moves.append(((nr, nc), dist_to_player))
         if not possible_moves:
@@ -465,14 +1987,369 @@ class Monster():
         best_dist = possible_moves[0][1]
         equally_good_moves = [move_info for move_info in possible_moves if move_info[1] == best_dist]
         if len(equally_good_moves) > 0:
-            chosen_move_coords, _ = random.choice(equally_good_moves)
+            chosen_move_coords, _ = self.rng.choice(equally_good_moves)
             best_next_r, best_next_c = chosen_move_coords
             self.matrix_pos_x_row = best_next_r
             self.matrix_pos_y_col = best_next_c
             self._recalculate_screen_pos()
 
+    def _follow_field(self, maze, distance_field):
+        # Returns False when the monster's cell is not on the field (e.g. cut off from the player)
+        index = maze.cell_index(self.matrix_pos_x_row, self.matrix_pos_y_col)
+        next_index = chase_step(maze.walls, maze.num_cols, index, distance_field, self.rng)
+        if next_index is None:
+            return False
+        if next_index != index:
+            self.matrix_pos_x_row, self.matrix_pos_y_col = divmod(next_index, maze.num_cols)
+            self._recalculate_screen_pos()
+        return True
+
+def tree_depths(parent):
+    # Depth of every cell in a goal_tree (0 at the goal), by pointer jumping: each pass doubles how far
+    # every cell has looked up the tree, so about log2(deepest cell) NumPy passes in all
+    cells = np.arange(len(parent))
+    jump = np.where(parent >= 0, parent, cells)
+    depth = (parent >= 0).astype(np.int64)
+    while True:
+        hop = jump[jump]
+        if np.array_equal(hop, jump):
+            return depth
+        depth += depth[jump]
+        jump = hop
+
+class GoalTreeChase():
+    # The swarm's chase without a distance field. In a perfect maze the goal tree holds the only path between two
+    # cells, so a monster steps to its parent unless it is one of the player's ancestors; then it steps to the next
+    # ancestor down towards the player. The ancestors are kept by depth and updated per player step, so a tick
+    # costs O(monsters) instead of a BFS over the maze.
+    def __init__(self, goal_parent, player):
+        self.goal_parent = goal_parent
+        self.parent = np.frombuffer(goal_parent, dtype=np.int32).astype(np.int64)
+        self.depth = tree_depths(self.parent)
+        self.ancestors = np.zeros(len(goal_parent), dtype=np.int64) # By depth: the goal, ..., the player
+        self.player = -1
+        self.move_player(player)
+
+    def move_player(self, index):
+        previous = self.player
+        if index == previous:
+            return
+        self.player = index
+        if previous >= 0 and self.goal_parent[previous] == index:
+            return # Up a level: the ancestors above are unchanged
+        if previous >= 0 and self.goal_parent[index] == previous:
+            self.ancestors[self.depth[index]] = index
+            return
+        path = [index]
+        while self.goal_parent[path[-1]] >= 0:
+            path.append(self.goal_parent[path[-1]])
+        self.ancestors[:len(path)] = path[::-1]
+
+    def steps(self, cells):
+        # The next cell towards the player for each of cells
+        depth = self.depth[cells]
+        player_depth = self.depth[self.player]
+        on_path = (depth <= player_depth) & (self.ancestors[np.minimum(depth, player_depth)] == cells)
+        down = self.ancestors[np.minimum(depth + 1, player_depth)]
+        return np.where(on_path, down, self.parent[cells])
+
+class MonsterSwarm():
+    # Many monsters as NumPy arrays of cell indices, move timers and delays. Movement, collision and the
+    # screen positions are computed for the whole swarm at once; the sprite is loaded once and drawn with one blits call.
+    def __init__(self, maze, positions, delays, image_path="assets/monster_1.png", cell_size=SIZE):
+        if np is None:
+            raise RuntimeError("The monster swarm needs NumPy: pip install numpy")
+        self.maze = maze
+        self.cell_size = cell_size
+        self.positions = np.asarray(positions, dtype=np.int64)
+        self.delays = np.asarray(delays, dtype=np.int32)
+        self.timers = np.zeros(len(self.positions), dtype=np.int32)
+        self.previous_positions = self.positions.copy() # Cells at the start of the tick, for interpolation
+        max_size = int(cell_size * 0.8)
+        self.image = ASSETS.fit(image_path, max_size, max_size)
+        self.image_width, self.image_height = self.image.get_size() if self.image else (max_size, max_size)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def update(self, distance_field=None, tree_chase=None):
+        # Every monster whose timer ran out steps to its open neighbour closest to the player: read off the
+        # distance field, or straight from the goal tree with a GoalTreeChase
+        if not len(self.positions) or (distance_field is None and tree_chase is None):
+            return
+        self.timers += 1
+        ready = self.timers >= self.delays
+        if not ready.any():
+            return
+        self.timers[ready] = 0
+        if tree_chase is not None:
+            self.positions[ready] = tree_chase.steps(self.positions[ready])
+            return
+        walls = np.frombuffer(self.maze.walls, dtype=np.uint8)
+        distances = np.frombuffer(distance_field, dtype=np.int32)
+        current = self.positions[ready]
+        best = current.copy()
+        best_distance = distances[current]
+        cols = self.maze.num_cols
+        for delta, wall in neighbor_steps(cols):
+            is_open = (walls[current] & wall) == 0
+            neighbors = np.where(is_open, current + delta, current) # Outer walls are closed, so open neighbours are in range
+            distance = distances[neighbors]
+            closer = is_open & (distance >= 0) & (distance < best_distance)
+            best = np.where(closer, neighbors, best)
+            best_distance = np.where(closer, distance, best_distance)
+        self.positions[ready] = best
+
+    def snap(self):
+        self.previous_positions = self.positions.copy()
+
+    def caught(self, index):
+        return bool(len(self.positions)) and bool((self.positions == index).any())
+
+    def shift_rows(self, num_rows, rng=random):
+        # Endless mode: the window moved down num_rows rows; monsters left above it reappear in the new rows
+        cols = self.maze.num_cols
+        self.positions -= num_rows * cols
+        lost = self.positions < 0
+        if lost.any():
+            first_new = (self.maze.num_rows - num_rows) * cols
+            self.positions[lost] = [rng.randrange(first_new, self.maze.total_nodes) for _ in range(int(lost.sum()))]
+        self.snap()
+
+    def _screen_positions(self, camera, alpha=1.0):
+        size = self.cell_size
+        rows, cols = np.divmod(self.positions, self.maze.num_cols)
+        if alpha < 1.0:
+            previous_rows, previous_cols = np.divmod(self.previous_positions, self.maze.num_cols)
+            rows = previous_rows + (rows - previous_rows) * alpha
+            cols = previous_cols + (cols - previous_cols) * alpha
+        xs = np.rint(cols * size).astype(np.int64) + (size - self.image_width) // 2
+        ys = np.rint(rows * size).astype(np.int64) + (size - self.image_height) // 2
+        if camera:
+            xs = xs - camera.offset_x
+            ys = ys - camera.offset_y
+            width, height = camera.view_width, camera.view_height
+            visible = (xs > -self.image_width) & (xs < width) & (ys > -self.image_height) & (ys < height)
+            xs, ys = xs[visible], ys[visible]
+        return zip(xs.tolist(), ys.tolist())
+
+    def screen_rects(self, camera=None, alpha=1.0):
+        return [pygame.Rect(x, y, self.image_width, self.image_height) for x, y in self._screen_positions(camera, alpha)]
+
+    def render(self, background, camera=None, alpha=1.0):
+        if self.image:
+            image = self.image
+            background.blits([(image, position) for position in self._screen_positions(camera, alpha)], False)
+        else:
+            for rect in self.screen_rects(camera, alpha):
+                pygame.draw.rect(background, RED, rect)
+
+class MazePool():
+    # Keeps layouts for the next rounds generating in background workers so a restart can swap one in within a frame.
+    # Worker processes keep carving off the game's GIL; threads are the fallback where processes are unavailable.
+    # The caller names the seeds, in round order, so a round gets the same maze whether or not its worker was done.
+    def __init__(self, num_rows, num_cols, num_monsters=2, algorithm=DEFAULT_GENERATOR, swarm=False, size=POOL_SIZE, processes=True):
+        self.layout_args = (num_rows, num_cols, num_monsters)
+        self.algorithm = algorithm
+        self.swarm = swarm
+        self.size = size
+        self.workers = None
+        if processes:
+            try:
+                # Spawned, not forked: a forked child would inherit the SDL state and its SIGTERM handler
+                context = multiprocessing.get_context("spawn")
+                self.workers = context.Pool(max(1, min(size, (os.cpu_count() or 2) - 1)))
+            except (OSError, NotImplementedError, ImportError):
+                self.workers = None
+        if self.workers is None:
+            self.workers = multiprocessing.pool.ThreadPool(1)
+        self.pending = deque() # (seed, AsyncResult) in the order the seeds were requested
+
+    def request(self, seeds):
+        # Starts building the layouts for seeds (the next rounds' layout seeds, in order) not already queued
+        queued = {seed for seed, _ in self.pending}
+        for seed in seeds:
+            if seed not in queued:
+                args = self.layout_args + (seed, self.algorithm, self.swarm)
+                self.pending.append((seed, self.workers.apply_async(build_layout, args)))
+                queued.add(seed)
+
+    def take(self, seed):
+        # The layout for seed when its worker has finished, or None (the caller then carves that seed itself).
+        # Either way the seed leaves the queue, along with any requested before it.
+        while self.pending:
+            queued_seed, result = self.pending.popleft()
+            if queued_seed != seed:
+                continue
+            if not result.ready():
+                return None
+            try:
+                return result.get()
+            except Exception as e:
+                print(f"Warning: Background maze generation failed: {e}")
+                return None
+        return None
+
+    def close(self):
+        # Does not wait for mazes still being carved
+        self.workers.terminate()
+
+class Simulation():
+    # The game rules with no pygame: one player, the monsters chasing it and the goal, on a layout's walls.
+    # step() advances one tick: the player's moves, the chase field, the monsters, then the win and caught checks.
+    # Game runs its rounds on one too (all but swarm and endless ones), so bots play by the same rules.
+    # Cells are flat indices, directions are wall bits.
+    def __init__(self, layout, rng=random, max_ticks=None, monster_delay=None):
+        self.num_rows = layout.num_rows
+        self.num_cols = layout.num_cols
+        self.walls = layout.walls
+        self.goal_parent = layout.goal_parent
+        self.rng = rng
+        self.max_ticks = max_ticks
+        self.player = layout.start[0] * self.num_cols + layout.start[1]
+        self.goal = layout.finish[0] * self.num_cols + layout.finish[1]
+        self.monsters = [row * self.num_cols + col for row, col, _ in layout.monsters]
+        self.delays = [monster_delay or delay for _, _, delay in layout.monsters] # monster_delay overrides them all
+        self.timers = [0] * len(self.monsters)
+        self.chase_field = None
+        self.chase_source = -1
+        self.steps = {wall: row_step * self.num_cols + col_step for wall, (row_step, col_step) in DIRECTION_STEPS.items()}
+        self.ticks = 0
+        self.outcome = None # "won", "caught" or "timeout" once the game is over
+
+    def can_move(self, index, direction):
+        return not self.walls[index] & direction
+
+    def step(self, *directions):
+        # One tick with the player trying each move in directions (wall bits; None stands still); returns the outcome
+        if self.outcome:
+            return self.outcome
+        self.ticks += 1
+        for direction in directions:
+            if direction is not None and self.can_move(self.player, direction):
+                self.player += self.steps[direction]
+        for i, index in enumerate(self.monsters):
+            self.timers[i] += 1
+            if self.timers[i] < self.delays[i]:
+                continue
+            self.timers[i] = 0
+            if self.player != self.chase_source:
+                # Only when a monster moves: the player takes several steps between monster moves
+                self.chase_field = distance_field(self.walls, self.num_rows, self.num_cols, self.player, self.monsters)
+                self.chase_source = self.player
+            next_index = chase_step(self.walls, self.num_cols, index, self.chase_field, self.rng)
+            if next_index is not None:
+                self.monsters[i] = next_index
+        if self.player == self.goal:
+            self.outcome = "won"
+        elif self.player in self.monsters:
+            self.outcome = "caught"
+        elif self.max_ticks is not None and self.ticks >= self.max_ticks:
+            self.outcome = "timeout"
+        return self.outcome
+
+    def run(self, bot, move_ticks=BOT_MOVE_TICKS):
+        # Plays to the end, asking bot for a direction every move_ticks ticks
+        while not self.outcome:
+            self.step(bot.choose(self) if self.ticks % move_ticks == 0 else None)
+        return self.outcome
+
+# Scripted players for Simulation. choose(simulation) returns the wall bit of the next move, or None.
+
+CLOCKWISE = (WALL_TOP, WALL_RIGHT, WALL_BOTTOM, WALL_LEFT)
+
+class RandomWalkBot():
+    # Any open direction, uniformly
+    def __init__(self, rng=random):
+        self.rng = rng
+
+    def choose(self, simulation):
+        return self.rng.choice([direction for direction in CLOCKWISE if simulation.can_move(simulation.player, direction)])
+
+class WallFollowerBot():
+    # Right-hand rule: turn right when it can, else straight on, else left, else back. Reaches any goal in a
+    # perfect maze, in up to two walks of every corridor.
+    def __init__(self, rng=random):
+        self.heading = rng.choice(CLOCKWISE)
+
+    def choose(self, simulation):
+        turn = CLOCKWISE.index(self.heading)
+        for offset in (1, 0, 3, 2):
+            direction = CLOCKWISE[(turn + offset) % 4]
+            if simulation.can_move(simulation.player, direction):
+                self.heading = direction
+                return direction
+        return None
+
+class SolverBot():
+    # Walks the goal tree's shortest path and ignores the monsters: the upper bound on what a player can do
+    # without dodging
+    def choose(self, simulation):
+        parent = simulation.goal_parent[simulation.player]
+        if parent < 0:
+            return None
+        delta = parent - simulation.player
+        return next(direction for direction, step in simulation.steps.items() if step == delta)
+
+BOTS = { # Name -> factory taking the game's rng
+    "random": RandomWalkBot,
+    "wall-follower": WallFollowerBot,
+    "solver": lambda rng: SolverBot(),
+}
+
+def play_bot_game(seed, bot, num_rows, num_cols, num_monsters=2, algorithm=DEFAULT_GENERATOR, move_ticks=BOT_MOVE_TICKS,
+                  max_ticks=BOT_MAX_TICKS, monster_delay=None, min_distance=MIN_DIST_MONSTER_FROM_PLAYER):
+    # One headless game on the maze build_layout makes from seed; returns (outcome, ticks). Module-level and
+    # display-free so that pool workers can run it.
+    layout = build_layout(num_rows, num_cols, num_monsters, seed, algorithm, min_distance=min_distance)
+    rng = random.Random(seed)
+    simulation = Simulation(layout, rng, max_ticks, monster_delay)
+    return simulation.run(BOTS[bot](rng), move_ticks), simulation.ticks
+
+def run_bots(bot, num_games, num_rows, num_cols, num_monsters=2, algorithm=DEFAULT_GENERATOR, seed=None, processes=None,
+             move_ticks=BOT_MOVE_TICKS, max_ticks=BOT_MAX_TICKS, monster_delay=None, min_distance=MIN_DIST_MONSTER_FROM_PLAYER):
+    # Plays num_games games of bot across a process pool (processes=0 plays them here) and returns
+    # (outcome counts, ticks of each game by outcome, wall seconds). Game i uses seed + i, so runs repeat.
+    base_seed = seed if seed is not None else random.getrandbits(32)
+    seeds = range(base_seed, base_seed + num_games)
+    play = functools.partial(play_bot_game, bot=bot, num_rows=num_rows, num_cols=num_cols, num_monsters=num_monsters,
+                             algorithm=algorithm, move_ticks=move_ticks, max_ticks=max_ticks,
+                             monster_delay=monster_delay, min_distance=min_distance)
+    ticks = {"won": [], "caught": [], "timeout": []}
+    started = time.perf_counter()
+    if processes == 0:
+        results = map(play, seeds)
+        workers = None
+    else:
+        # Spawned for the same reason as MazePool's workers
+        processes = processes or os.cpu_count() or 1
+        workers = multiprocessing.get_context("spawn").Pool(processes)
+        results = workers.imap_unordered(play, seeds, chunksize=max(1, num_games // (8 * processes)))
+    try:
+        for outcome, game_ticks in results:
+            ticks[outcome].append(game_ticks)
+    finally:
+        if workers is not None:
+            workers.terminate()
+    return {outcome: len(values) for outcome, values in ticks.items()}, ticks, time.perf_counter() - started
+
+def report_bots(bot, num_games, num_rows, num_cols, num_monsters=2, algorithm=DEFAULT_GENERATOR, seed=None, processes=None, **options):
+    # run_bots, printed: the win rate, how long the bot lasted when caught and the throughput
+    counts, ticks, seconds = run_bots(bot, num_games, num_rows, num_cols, num_monsters, algorithm, seed, processes, **options)
+    print(f"{bot} bot, {num_games:,} games on {num_rows}x{num_cols} {algorithm} mazes with {num_monsters} monsters")
+    for outcome in ("won", "caught", "timeout"):
+        values = sorted(ticks[outcome])
+        line = f"{outcome:<8} {counts[outcome]:>7,} {counts[outcome] / num_games:>7.1%}"
+        if values:
+            mean, median = sum(values) / len(values) / TICK_RATE, values[len(values) // 2] / TICK_RATE
+            line += f"   after {mean:.1f}s on average, median {median:.1f}s"
+        print(line)
+    print(f"{num_games / seconds:,.1f} games/s, {sum(map(sum, ticks.values())) / seconds:,.0f} ticks/s ({seconds:.2f}s)")
+
 class Game():
-    def _init_(self): # CORRECTED
+    def __init__(self, num_rows=None, num_cols=None, cell_size=SIZE, solve_frames=SOLVE_FRAMES, algorithm=DEFAULT_GENERATOR,
+                 endless=False, num_monsters=2, swarm=False, pregenerate=POOL_SIZE, fps=FPS, tick_rate=TICK_RATE,
+                 profile_path=None, layout=None, solver=GOAL_TREE_SOLVER, seed=None, record_path=None):
         try:
             pygame.init()
             pygame.font.init()
@@ -482,6 +2359,28 @@ class Game():
         self.screen = None 
         self.maze = None
         self.player = None
+        self.camera = None
+        self.renderer = None
+        self.minimap = None # Minimap in the info panel, for mazes larger than the window
+        self.ticks = 0 # Simulation ticks run, so the minimap is redrawn at most once per tick
+        self.minimap_tick = -1
+        self.panel_state = None # What the info panel last showed; it is only redrawn when this changes
+        self.cell_size = cell_size
+        self.num_rows = num_rows if num_rows is not None else HEIGHT // cell_size
+        self.num_cols = num_cols if num_cols is not None else WIDTH // cell_size
+        self.solve_frames = solve_frames
+        self.solver = solver
+        self.algorithm = algorithm
+        self.fps = fps
+        self.sim_clock = SimulationClock(tick_rate) # Game logic advances in fixed ticks whatever the frame rate
+        self.show_profile = False # F3 overlay with the FrameProfiler percentiles
+        self.profile_path = profile_path # Where the recorded frame trace is written on exit
+        self.endless = endless
+        self.depth = 0
+        if endless:
+            # Only a window of the endless maze is kept; it advances by one screen when the player nears its bottom
+            self.visible_rows = max(1, HEIGHT // cell_size)
+            self.num_rows = ENDLESS_WINDOW_SCREENS * self.visible_rows
         self.initial_coordinate_x_row = 0
         self.initial_coordinate_y_col = 0
         self.final_coordinate_x_row = 0
@@ -490,16 +2389,39 @@ class Game():
         self.solved_by_system = False
         self.winner = False
         self.exit_game = False
+        self.paused = False
         self.monsters = []
+        self.swarm = None # MonsterSwarm replacing the Monster objects in swarm mode
+        self.tree_chase = None # GoalTreeChase steering the swarm when the maze has a goal tree
+        self.simulation = None # Runs the rules of a round with a fixed maze; the Monster objects are only its sprites
+        self.use_swarm = swarm
+        self.pregenerate = pregenerate
+        self.pool = None # MazePool with layouts for the next restarts
+        self.fixed_layout = layout # A loaded maze file, replayed on every restart
+        if layout:
+            self.num_rows, self.num_cols = layout.num_rows, layout.num_cols
+        self.chase_field = None # Maze distance from every cell to the player, shared by all monsters
+        self.chase_source = -1 # Player cell the field was computed from
+        self.player_cell = -1 # Player cell goal_distance refers to
+        self.goal_distance = None # Steps left to the goal, kept up to date from the maze's goal tree
         self.game_over = False
-        self.num_monsters = 2
+        self.num_monsters = num_monsters
+        self.seeds = random.Random(seed) # Draws every round's seeds, so one session seed repeats the whole session
+        self.upcoming_rounds = deque() # (layout seed, round seed) for the next rounds, drawn from self.seeds in order
+        self.round_seed = None
+        self.rng = random.Random() # All of a round's randomness: spawns, monster tie-breaks, endless rows
+        self.record_path = record_path
+        self.recorder = None # InputRecorder writing record_path on exit
+        if record_path:
+            flags = (REPLAY_FIXED_LAYOUT if layout else 0) | (REPLAY_ENDLESS if endless else 0) | (REPLAY_SWARM if swarm else 0)
+            self.recorder = InputRecorder(self.num_rows, self.num_cols, num_monsters, algorithm, cell_size, tick_rate, flags)
         self.legend_player_icon = None
         self.legend_start_icon = None
         self.legend_finish_icon = None
         self.legend_icon_size = int(SIZE * 0.8)
         self.start_cell_icon_surf = None 
         self.finish_cell_icon_surf = None 
-        self.cell_icon_size = int(SIZE * 0.9)
+        self.cell_icon_size = max(1, int(cell_size * 0.9))
 
     def _load_icons(self):
         icon_paths = {
@@ -511,15 +2433,8 @@ class Game():
         }
         loaded_icons = {}
         for key, path in icon_paths.items():
-            try:
-                img = pygame.image.load(path).convert_alpha()
-                if "legend" in key:
-                    loaded_icons[key] = pygame.transform.smoothscale(img, (self.legend_icon_size, self.legend_icon_size))
-                else: 
-                    loaded_icons[key] = pygame.transform.smoothscale(img, (self.cell_icon_size, self.cell_icon_size))
-            except pygame.error as e:
-                print(f"Error loading icon '{path}': {e}")
-                loaded_icons[key] = None
+            size = self.legend_icon_size if "legend" in key else self.cell_icon_size
+            loaded_icons[key] = ASSETS.scaled(path, (size, size))
         
         self.legend_player_icon = loaded_icons.get("player_legend")
         self.legend_start_icon = loaded_icons.get("start_legend")
@@ -527,86 +2442,163 @@ class Game():
         self.start_cell_icon_surf = loaded_icons.get("start_cell")
         self.finish_cell_icon_surf = loaded_icons.get("finish_cell")
 
-    def setup_new_game(self):
+    def setup_new_game(self, layout=None, round_seed=None):
+        # With a MazeLayout the maze arrives already carved and populated; without one a layout is generated
+        # here (no animation), or in endless mode the first window is streamed in. round_seed seeds everything
+        # random in the round; by default the next round's seeds are drawn from the session seed.
+        if self.recorder: self.recorder.end_round(self.round_outcome())
         self.screen = pygame.display.set_mode(SCREEN_SIZE)
         pygame.display.set_caption('Maze Game with Monsters - Final Step')
         self._load_icons() 
-        num_rows = HEIGHT // SIZE
-        num_cols = WIDTH // SIZE
-        min_dist_start_finish = max(7, (num_rows + num_cols) // 3) 
-        
-        attempts = 0
-        max_attempts_spawn = 100
-        while attempts < max_attempts_spawn:
-            self.initial_coordinate_x_row = random.randint(0, num_rows - 1)
-            self.initial_coordinate_y_col = random.randint(0, num_cols - 1)
-            self.final_coordinate_x_row = random.randint(0, num_rows - 1)
-            self.final_coordinate_y_col = random.randint(0, num_cols - 1)
-            dist = abs(self.initial_coordinate_x_row - self.final_coordinate_x_row) + \
-                   abs(self.initial_coordinate_y_col - self.final_coordinate_y_col)
-            if dist >= min_dist_start_finish and \
-               not (self.initial_coordinate_x_row == self.final_coordinate_x_row and \
-                    self.initial_coordinate_y_col == self.final_coordinate_y_col):
-                break 
-            attempts += 1
-        else: 
-            print(f"Warning: Could not ensure min distance for start/finish after {max_attempts_spawn} attempts. Using last random points.")
+        num_rows = self.num_rows
+        num_cols = self.num_cols
+        layout_seed = round_seed
+        if round_seed is None:
+            layout_seed, round_seed = self.next_round_seeds()
+        self.round_seed = round_seed
+        self.rng = random.Random(self.round_seed)
+        if layout is None and not self.endless:
+            layout = build_layout(num_rows, num_cols, self.num_monsters, layout_seed, self.algorithm, self.use_swarm)
+        if self.recorder:
+            layout_seed = layout.seed if layout and layout is not self.fixed_layout else 0
+            self.recorder.start_round(layout_seed, self.round_seed)
+        if layout:
+            (self.initial_coordinate_x_row, self.initial_coordinate_y_col), \
+                (self.final_coordinate_x_row, self.final_coordinate_y_col) = layout.start, layout.finish
+        elif self.endless:
+            # No goal: start on the top row and see how deep you get
+            self.initial_coordinate_x_row, self.initial_coordinate_y_col = 0, self.rng.randint(0, num_cols - 1)
+            self.final_coordinate_x_row, self.final_coordinate_y_col = -1, -1
 
-        self.maze = Maze(self.screen, 
+        if self.endless:
+            self.maze = EndlessMaze(self.screen, self.initial_coordinate_x_row, self.initial_coordinate_y_col,
+                                    start_cell_icon=self.start_cell_icon_surf,
+                                    num_rows=num_rows, num_cols=num_cols, cell_size=self.cell_size)
+        else:
+            self.maze = Maze(self.screen, 
                            self.initial_coordinate_x_row, self.initial_coordinate_y_col, 
                            self.final_coordinate_x_row, self.final_coordinate_y_col,
                            start_cell_icon=self.start_cell_icon_surf, 
-                           finish_cell_icon=self.finish_cell_icon_surf)
-        self.player = Player(self.initial_coordinate_x_row, self.initial_coordinate_y_col)
+                           finish_cell_icon=self.finish_cell_icon_surf,
+                           num_rows=num_rows, num_cols=num_cols, cell_size=self.cell_size, algorithm=self.algorithm)
+        if layout:
+            self.maze.load_walls(layout.walls, layout.goal_parent)
+            layout.goal_parent = self.maze.goal_parent # A loaded maze file replays without rebuilding it
+        else:
+            self.maze.dfs(seed=self.rng.getrandbits(32))
+        self.player = Player(self.initial_coordinate_x_row, self.initial_coordinate_y_col,
+                             num_rows=num_rows, num_cols=num_cols, cell_size=self.cell_size)
+        self.camera = Camera(WIDTH, HEIGHT, num_rows, num_cols, self.cell_size)
+        self.camera.follow(self.initial_coordinate_x_row, self.initial_coordinate_y_col)
+        self.camera.snap()
+        self.renderer = MazeRenderer(self.screen, self.maze, self.camera)
+        larger_than_window = num_rows * self.cell_size > HEIGHT or num_cols * self.cell_size > WIDTH
+        self.minimap = Minimap(self.maze) if np is not None and larger_than_window else None
+        self.panel_state = None
+        self.depth = 0
+        self.chase_field = None
+        self.chase_source = -1
+        self.player_cell = self.maze.cell_index(self.initial_coordinate_x_row, self.initial_coordinate_y_col)
+        self.goal_distance = None
+        if self.maze.goal_parent is not None:
+            self.goal_distance = len(self.maze.path_to_goal(self.initial_coordinate_x_row, self.initial_coordinate_y_col)) - 1
         self.solved_by_system = False
         self.winner = False
         self.game_over = False
+        self.paused = False
         self.monsters = []     
-        spawned_monster_positions = []
-        min_dist_monster_from_player = 7
-
-        for i in range(self.num_monsters):
-            monster_row, monster_col = -1, -1
-            valid_spawn = False
-            attempts = 0 
-            max_attempts = num_rows * num_cols 
-            while not valid_spawn and attempts < max_attempts:
-                attempts += 1
-                monster_row = random.randint(0, num_rows - 1)
-                monster_col = random.randint(0, num_cols - 1)
-                on_player_start = (monster_row == self.initial_coordinate_x_row and \
-                                   monster_col == self.initial_coordinate_y_col)
-                on_player_goal = (monster_row == self.final_coordinate_x_row and \
-                                  monster_col == self.final_coordinate_y_col)
-                on_other_monster = False
-                for M_pos_r, M_pos_c in spawned_monster_positions:
-                    if monster_row == M_pos_r and monster_col == M_pos_c:
-                        on_other_monster = True
-                        break
-                distance_to_player = abs(monster_row - self.initial_coordinate_x_row) + \
-                                     abs(monster_col - self.initial_coordinate_y_col)
-                if not on_player_start and not on_player_goal and not on_other_monster and \
-                   distance_to_player >= min_dist_monster_from_player:
-                    valid_spawn = True
-            if valid_spawn: 
-                if i == 0: 
-                    monster_image_path = "assets/monster_1.png"
-                elif i == 1: 
-                    monster_image_path = "assets/monster_2.png"
-                else: 
-                    monster_image_path = "assets/monster.png" 
-                new_monster = Monster(monster_row, monster_col, image_path=monster_image_path, move_delay=random.randint(20, 25 + i*5))
-                self.monsters.append(new_monster)
-                spawned_monster_positions.append((monster_row, monster_col))
-            else:
-                print(f"Warning: Could not find a valid spawn position for monster {i+1} after {max_attempts} attempts.")
+        self.swarm = None
+        self.tree_chase = None
+        self.simulation = None
+
+        start = (self.initial_coordinate_x_row, self.initial_coordinate_y_col)
+        finish = (self.final_coordinate_x_row, self.final_coordinate_y_col)
+        if layout:
+            spawns = layout.monsters
+        else:
+            distances = distance_field(self.maze.walls, num_rows, num_cols, self.maze.cell_index(*start))
+            spawns = place_monsters(distances, num_cols, start, finish, self.num_monsters, self.rng, swarm=self.use_swarm)
+
+        if self.use_swarm:
+            positions = [row * num_cols + col for row, col, _ in spawns]
+            delays = [move_delay for _, _, move_delay in spawns]
+            self.swarm = MonsterSwarm(self.maze, positions, delays, cell_size=self.cell_size)
+            if self.maze.goal_parent is not None and not self.endless:
+                self.tree_chase = GoalTreeChase(self.maze.goal_parent, self.maze.cell_index(*start))
+            return
+        for i, (monster_row, monster_col, move_delay) in enumerate(spawns):
+            monster_image_path = "assets/monster_1.png" if i % 2 == 0 else "assets/monster_2.png"
+            new_monster = Monster(monster_row, monster_col, image_path=monster_image_path, move_delay=move_delay,
+                                  num_rows=num_rows, num_cols=num_cols, cell_size=self.cell_size, rng=self.rng)
+            self.monsters.append(new_monster)
+        if layout and not self.endless:
+            self.simulation = Simulation(layout, self.rng)
+
+    def upcoming_round_seeds(self, count):
+        # The seeds of the next count rounds. Drawn once and in round order, so the pool's lookahead never
+        # changes which seeds a round gets.
+        while len(self.upcoming_rounds) < count:
+            self.upcoming_rounds.append((self.seeds.getrandbits(32), self.seeds.getrandbits(32)))
+        return list(self.upcoming_rounds)[:count]
+
+    def next_round_seeds(self):
+        # (layout seed, round seed) for the round about to start
+        self.upcoming_round_seeds(1)
+        return self.upcoming_rounds.popleft()
+
+    def start_pool(self, processes=True):
+        self.pool = MazePool(self.num_rows, self.num_cols, self.num_monsters, self.algorithm, self.use_swarm, self.pregenerate,
+                             processes)
+        self.pool.request([seed for seed, _ in self.upcoming_round_seeds(self.pool.size)])
+
+    def start_round(self):
+        # Swaps in the pre-generated maze when it is ready, otherwise carves the same seed here with the progress animation
+        layout_seed, round_seed = self.next_round_seeds()
+        layout = self.fixed_layout or (self.pool.take(layout_seed) if self.pool else None)
+        if self.pool:
+            self.pool.request([seed for seed, _ in self.upcoming_round_seeds(self.pool.size)])
+        if layout is None and not self.endless:
+            layout = self.carve_layout(layout_seed)
+        self.setup_new_game(layout, round_seed)
+        self.invalidate_display()
+
+    def carve_layout(self, seed):
+        # Start, goal and spawns are placed by maze distance, so the maze is carved (on screen) before they are chosen.
+        # Seeded the way build_layout is, so the layout can be rebuilt from its seed alone.
+        if not self.screen: self.screen = pygame.display.set_mode(SCREEN_SIZE)
+        self.screen.fill(BLACK)
+        rng = random.Random(seed)
+        carving = Maze(self.screen, -1, -1, -1, -1, num_rows=self.num_rows, num_cols=self.num_cols,
+                       cell_size=self.cell_size, algorithm=self.algorithm)
+        carving.dfs(self.screen, Camera(WIDTH, HEIGHT, self.num_rows, self.num_cols, self.cell_size), rng.getrandbits(32))
+        return place_layout(carving.walls, self.num_rows, self.num_cols, self.num_monsters, rng, self.use_swarm, seed,
+                            self.algorithm)
 
     def update_game_state(self, events):
+        # One fixed simulation tick; rendering interpolates from the positions snapped here
+        self.snap_sprites()
+        self.ticks += 1
+        directions = [KEY_DIRECTIONS[event.key] for event in events
+                      if event.type == pygame.KEYDOWN and event.key in KEY_DIRECTIONS]
+        if self.recorder:
+            self.recorder.tick(directions)
         if self.game_over or self.winner or self.solved_by_system:
             return
-        if self.player : self.player.update(self.maze.maze, events) # Check if player exists
+        if self.simulation:
+            self.step_simulation(directions)
+            return
+        if self.player : # Check if player exists
+            self.player.update(self.maze, events)
+            if self.goal_distance is not None: self.update_goal_distance()
+            if self.endless: self.advance_endless()
+            self.camera.follow(self.player.matrix_pos_x_row, self.player.matrix_pos_y_col)
+        if self.tree_chase:
+            self.tree_chase.move_player(self.maze.cell_index(self.player.matrix_pos_x_row, self.player.matrix_pos_y_col))
+        elif self.player and (self.monsters or self.swarm):
+            self.update_chase_field()
         for monster_obj in self.monsters:
-            if self.player : monster_obj.update(self.player, self.maze.maze) # Check if player exists
+            if self.player : monster_obj.update(self.player, self.maze, self.chase_field) # Check if player exists
+        if self.swarm: self.swarm.update(self.chase_field, self.tree_chase)
         
         if self.player and self.player.matrix_pos_x_row == self.final_coordinate_x_row and \
            self.player.matrix_pos_y_col == self.final_coordinate_y_col:
@@ -615,6 +2607,10 @@ class Game():
             return
         
         if self.player: # Check if player exists before checking collision
+            if self.swarm and self.swarm.caught(self.maze.cell_index(self.player.matrix_pos_x_row, self.player.matrix_pos_y_col)):
+                print("Game Over - Caught by Monster!")
+                self.game_over = True
+                return
             for monster_obj in self.monsters:
                 if self.player.matrix_pos_x_row == monster_obj.matrix_pos_x_row and \
                 self.player.matrix_pos_y_col == monster_obj.matrix_pos_y_col:
@@ -622,6 +2618,82 @@ class Game():
                     self.game_over = True
                     return
 
+    def step_simulation(self, directions):
+        # The round's rules run on self.simulation; the sprites only follow its cells
+        outcome = self.simulation.step(*directions)
+        num_cols = self.maze.num_cols
+        self.player.move_to(*divmod(self.simulation.player, num_cols))
+        for monster_obj, index in zip(self.monsters, self.simulation.monsters):
+            monster_obj.move_to(*divmod(index, num_cols))
+        if self.goal_distance is not None: self.update_goal_distance()
+        self.camera.follow(self.player.matrix_pos_x_row, self.player.matrix_pos_y_col)
+        if outcome == "won":
+            print("Winner!")
+            self.winner = True
+        elif outcome == "caught":
+            print("Game Over - Caught by Monster!")
+            self.game_over = True
+
+    def update_goal_distance(self):
+        # O(1) per step: in a perfect maze a step changes the distance to the goal by exactly one, downwards
+        # when it goes to the cell's parent in the goal tree. Several steps in one tick fall back to a walk.
+        row, col = self.player.matrix_pos_x_row, self.player.matrix_pos_y_col
+        cell, previous = self.maze.cell_index(row, col), self.player_cell
+        if cell == previous:
+            return
+        parent = self.maze.goal_parent
+        if parent[previous] == cell: self.goal_distance -= 1
+        elif parent[cell] == previous: self.goal_distance += 1
+        else: self.goal_distance = len(self.maze.path_to_goal(row, col)) - 1
+        self.player_cell = cell
+
+    def snap_sprites(self):
+        for sprite in ([self.player] if self.player else []) + self.monsters + ([self.swarm] if self.swarm else []):
+            sprite.snap()
+        if self.camera: self.camera.snap()
+
+    def simulate(self, num_ticks, events=()):
+        # Runs the game logic without rendering or waiting, as fast as the CPU allows; events go to the first tick
+        for tick in range(num_ticks):
+            self.update_game_state(events if tick == 0 else ())
+            if self.game_over or self.winner:
+                return tick + 1
+        return num_ticks
+
+    def update_chase_field(self):
+        # Recomputed only when the player changes cell; every monster then reads its next step in O(1)
+        source = self.maze.cell_index(self.player.matrix_pos_x_row, self.player.matrix_pos_y_col)
+        if source == self.chase_source and self.chase_field is not None:
+            return
+        targets = [self.maze.cell_index(monster_obj.matrix_pos_x_row, monster_obj.matrix_pos_y_col) for monster_obj in self.monsters]
+        if self.swarm: targets.extend(self.swarm.positions.tolist())
+        self.chase_field = distance_field(self.maze.walls, self.maze.num_rows, self.maze.num_cols, source, targets)
+        self.chase_source = source
+
+    def advance_endless(self):
+        # Streams in a screen of new rows once the player reaches the last screen of the window
+        row = self.player.matrix_pos_x_row
+        self.depth = max(self.depth, self.maze.row_offset + row)
+        if row < self.num_rows - self.visible_rows:
+            return
+        shift = self.visible_rows
+        self.maze.advance(shift)
+        self.player.matrix_pos_x_row -= shift
+        self.player._recalculate_screen_pos()
+        for monster_obj in self.monsters:
+            monster_obj.matrix_pos_x_row -= shift
+            if monster_obj.matrix_pos_x_row < 0:
+                # Left behind: it comes back from the fresh rows below
+                monster_obj.matrix_pos_x_row = self.rng.randint(self.num_rows - shift, self.num_rows - 1)
+                monster_obj.matrix_pos_y_col = self.rng.randint(0, self.num_cols - 1)
+            monster_obj._recalculate_screen_pos()
+        if self.swarm: self.swarm.shift_rows(shift, self.rng)
+        self.camera.follow(self.player.matrix_pos_x_row, self.player.matrix_pos_y_col)
+        self.snap_sprites() # The whole window moved; nothing should slide across it
+        self.chase_field = None # Cell indices shifted with the window
+        self.renderer.invalidate()
+        if self.minimap: self.minimap.invalidate()
+
     def initial_screen(self):
         if not self.screen: # Ensure screen is initialized
             self.screen = pygame.display.set_mode(SCREEN_SIZE)
@@ -634,30 +2706,69 @@ class Game():
         pygame.draw.rect(self.screen, DARKBLUE, [110, 150, WIDTH - 220, 100])
         text(self.screen, "ESCAPE THE MAZE", LIGHTORANGE, FONTSIZE_START, coordinate_y=197, center=True)
         text(self.screen, "(ESC) TO EXIT ADVENTURE", INTERMEDIARYORANGE, FONTSIZE_COMMANDS_INTIAL, coordinate_y=HEIGHT_TOTAL - 150, center=True)
-        pygame.display.update()
-        pygame.time.wait(10) # Reduced wait time for faster testing
         text(self.screen, "READY? PRESS (S) TO START!", INTERMEDIARYORANGE, FONTSIZE_COMMANDS_INTIAL, coordinate_y=HEIGHT_TOTAL - 175, center=True)
         pygame.display.update()
-        pygame.time.wait(10) # Reduced wait time
 
-    def render_game_elements(self):
+    def draw_intro_prompt(self, visible):
+        # Blinks the start prompt by repainting only its line
+        prompt = render_text("READY? PRESS (S) TO START!", INTERMEDIARYORANGE, get_font(FONT_PATH, FONTSIZE_COMMANDS_INTIAL))
+        prompt_rect = prompt.get_rect(center=(WIDTH // 2, HEIGHT_TOTAL - 175))
+        self.screen.fill(LIGHTBLUE, prompt_rect)
+        if visible:
+            self.screen.blit(prompt, prompt_rect)
+        pygame.display.update(prompt_rect)
+
+    def invalidate_display(self):
+        # Call after anything drew straight to the screen (carving, solver animation) so the next frame repaints it all
+        if self.renderer: self.renderer.invalidate()
+        if self.minimap: self.minimap.invalidate()
+        self.panel_state = None
+
+    def render_game_elements(self, alpha=1.0):
         if not self.screen: return # Should not happen if setup_new_game was called
 
-        self.screen.fill(BLACK)
-        if self.maze: self.maze.render(self.screen)
-        if self.player: self.player.render(self.screen)
-        for monster_obj in self.monsters:
-            monster_obj.render(self.screen)
-        try:
-            arial_font = pygame.font.SysFont("arial", FONTSIZE_MAZE)
-            arial_font_bigger = pygame.font.SysFont("arial", FONTSIZE_MESSAGE)
-        except Exception as e:
-            print(f"Error loading system font: {e}")
-            arial_font = pygame.font.Font(None, FONTSIZE_MAZE)
-            arial_font_bigger = pygame.font.Font(None, FONTSIZE_MESSAGE)
+        sprites = ([self.player] if self.player else []) + self.monsters + ([self.swarm] if self.swarm else [])
+        if self.camera: self.camera.interpolate(alpha)
+        dirty_rects = self.renderer.draw(sprites, alpha) if self.renderer else []
+        panel_state = (self.game_over, self.winner, self.solved_by_system, self.paused, self.depth, self.goal_distance)
+        panel_redrawn = panel_state != self.panel_state
+        if panel_redrawn:
+            self.panel_state = panel_state
+            dirty_rects.append(self.render_info_panel())
+        if self.minimap and (panel_redrawn or self.ticks != self.minimap_tick):
+            self.minimap_tick = self.ticks
+            dirty_rects.append(self.render_minimap())
+        PROFILER.mark("panel")
+        if self.show_profile:
+            dirty_rects.append(PROFILER.render(self.screen))
+            PROFILER.mark("overlay")
+        if dirty_rects:
+            pygame.display.update(dirty_rects)
+        PROFILER.mark("display")
+
+    def render_minimap(self):
+        if self.swarm:
+            monsters = self.swarm.positions
+        else:
+            monsters = [self.maze.cell_index(monster_obj.matrix_pos_x_row, monster_obj.matrix_pos_y_col) for monster_obj in self.monsters]
+        goal = None if self.endless else self.maze.cell_index(self.final_coordinate_x_row, self.final_coordinate_y_col)
+        player = self.maze.cell_index(self.player.matrix_pos_x_row, self.player.matrix_pos_y_col)
+        return self.minimap.render(self.screen, player, goal, monsters, self.camera)
+
+    def toggle_profile(self):
+        self.show_profile = not self.show_profile
+        PROFILER.enabled = self.show_profile or PROFILER.recording
+        if not self.show_profile:
+            self.invalidate_display() # Paint over the overlay
+
+    def render_info_panel(self):
+        panel_rect = pygame.Rect(0, HEIGHT, WIDTH, HEIGHT_TOTAL - HEIGHT)
+        self.screen.fill(BLACK, panel_rect)
+        arial_font = get_font(None, FONTSIZE_MAZE)
+        arial_font_bigger = get_font(None, FONTSIZE_MESSAGE)
 
         def draw_text_arial(surface, msg, color, font, x, y, align_right=False, center=False):
-            text_surface_arial = font.render(msg, True, color)
+            text_surface_arial = render_text(msg, color, font)
             text_rect_arial = text_surface_arial.get_rect()
             if center: text_rect_arial.center = (x, y)
             elif align_right: text_rect_arial.topright = (x, y)
@@ -669,19 +2780,35 @@ class Game():
         text_x_offset = icon_x_pos + self.legend_icon_size + 5 
         icon_y_center_offset = (self.legend_icon_size - FONTSIZE_MAZE) // 2
         message_area_y_center = HEIGHT + (HEIGHT_TOTAL - HEIGHT) // 2
+        # With a minimap the messages go to its left, so it stays on screen (with the solution) once the round is over
+        message_x = MINIMAP_AREA[0] // 2 if self.minimap else WIDTH // 2
 
         if self.game_over:
-            draw_text_arial(self.screen, "GAME OVER - CAUGHT!", RED, arial_font_bigger, WIDTH // 2, message_area_y_center -15 , center=True)
-            draw_text_arial(self.screen, "R → TRY AGAIN", WHITE, arial_font, WIDTH // 2, message_area_y_center + 15, center=True)
-            draw_text_arial(self.screen, "ESC → EXIT", WHITE, arial_font, WIDTH // 2, message_area_y_center + 35, center=True)
+            caught_message = f"CAUGHT AT DEPTH {self.depth}!" if self.endless else "GAME OVER - CAUGHT!"
+            draw_text_arial(self.screen, caught_message, RED, arial_font_bigger, message_x, message_area_y_center -15 , center=True)
+            draw_text_arial(self.screen, "R → TRY AGAIN", WHITE, arial_font, message_x, message_area_y_center + 15, center=True)
+            draw_text_arial(self.screen, "ESC → EXIT", WHITE, arial_font, message_x, message_area_y_center + 35, center=True)
         elif self.winner:
-            draw_text_arial(self.screen, "MAZE COMPLETED!", BLUE, arial_font_bigger, WIDTH // 2, message_area_y_center -15, center=True)
-            draw_text_arial(self.screen, "R → TRY AGAIN", WHITE, arial_font, WIDTH // 2, message_area_y_center + 15, center=True)
-            draw_text_arial(self.screen, "ESC → EXIT", WHITE, arial_font, WIDTH // 2, message_area_y_center + 35, center=True)
+            draw_text_arial(self.screen, "MAZE COMPLETED!", BLUE, arial_font_bigger, message_x, message_area_y_center -15, center=True)
+            draw_text_arial(self.screen, "R → TRY AGAIN", WHITE, arial_font, message_x, message_area_y_center + 15, center=True)
+            draw_text_arial(self.screen, "ESC → EXIT", WHITE, arial_font, message_x, message_area_y_center + 35, center=True)
         elif self.solved_by_system:
-            draw_text_arial(self.screen, "MAZE SOLVED BY SYSTEM!", PINK, arial_font_bigger, WIDTH // 2, message_area_y_center -15, center=True)
-            draw_text_arial(self.screen, "R → TRY AGAIN", WHITE, arial_font, WIDTH // 2, message_area_y_center + 15, center=True)
-            draw_text_arial(self.screen, "ESC → EXIT", WHITE, arial_font, WIDTH // 2, message_area_y_center + 35, center=True)
+            draw_text_arial(self.screen, "MAZE SOLVED BY SYSTEM!", PINK, arial_font_bigger, message_x, message_area_y_center -15, center=True)
+            if self.maze and self.maze.last_solve:
+                solver, expanded, seconds = self.maze.last_solve
+                if self.minimap: # Right of the minimap, where the controls are during play
+                    draw_text_arial(self.screen, f"{solver.upper()}:", WHITE, arial_font, WIDTH - 150, base_info_y + 5)
+                    draw_text_arial(self.screen, f"{expanded:,} CELLS, {seconds * 1000:.1f} MS", WHITE, arial_font,
+                                    WIDTH - 150, base_info_y + 20)
+                else:
+                    draw_text_arial(self.screen, f"{solver.upper()}: {expanded:,} CELLS, {seconds * 1000:.1f} MS", WHITE, arial_font,
+                                    10, message_area_y_center + 15)
+            draw_text_arial(self.screen, "R → TRY AGAIN", WHITE, arial_font, message_x, message_area_y_center + 15, center=True)
+            draw_text_arial(self.screen, "ESC → EXIT", WHITE, arial_font, message_x, message_area_y_center + 35, center=True)
+        elif self.paused:
+            draw_text_arial(self.screen, "PAUSED", WHITE, arial_font_bigger, message_x, message_area_y_center - 15, center=True)
+            draw_text_arial(self.screen, "P → RESUME", WHITE, arial_font, message_x, message_area_y_center + 15, center=True)
+            draw_text_arial(self.screen, "ESC → EXIT", WHITE, arial_font, message_x, message_area_y_center + 35, center=True)
         else: 
             current_y = base_info_y
             legend_items_x_start = 50 
@@ -699,60 +2826,322 @@ class Game():
             draw_text_arial(self.screen, "- ENTRY POINT", WHITE, arial_font, icon_x_pos + self.legend_icon_size + 5, current_y + icon_y_center_offset)
             current_y += self.legend_icon_size + 5
             
-            if self.legend_finish_icon:
-                self.screen.blit(self.legend_finish_icon, (icon_x_pos, current_y))
-            else: pygame.draw.rect(self.screen, LIGHTBLUE, [icon_x_pos, current_y, self.legend_icon_size, self.legend_icon_size])
-            draw_text_arial(self.screen, "- GOAL", WHITE, arial_font, icon_x_pos + self.legend_icon_size + 5, current_y + icon_y_center_offset)
+            if self.endless:
+                draw_text_arial(self.screen, f"DEPTH: {self.depth}", WHITE, arial_font, icon_x_pos, current_y + icon_y_center_offset)
+            else:
+                if self.legend_finish_icon:
+                    self.screen.blit(self.legend_finish_icon, (icon_x_pos, current_y))
+                else: pygame.draw.rect(self.screen, LIGHTBLUE, [icon_x_pos, current_y, self.legend_icon_size, self.legend_icon_size])
+                goal_label = "- GOAL" if self.goal_distance is None else f"- GOAL ({self.goal_distance} STEPS AWAY)"
+                draw_text_arial(self.screen, goal_label, WHITE, arial_font, icon_x_pos + self.legend_icon_size + 5, current_y + icon_y_center_offset)
             
             controls_text_y = base_info_y + 5
             controls_x_pos = WIDTH - 150 
             draw_text_arial(self.screen, "R → Restart", WHITE, arial_font, controls_x_pos, controls_text_y, align_right=False)
-            draw_text_arial(self.screen, "Q → Solve", WHITE, arial_font, controls_x_pos, controls_text_y + 15, align_right=False)
+            if not self.endless:
+                draw_text_arial(self.screen, "Q → Solve", WHITE, arial_font, controls_x_pos, controls_text_y + 15, align_right=False)
             draw_text_arial(self.screen, "ESC → Exit", WHITE, arial_font, controls_x_pos, controls_text_y + 30, align_right=False)
-        pygame.display.update()
+            draw_text_arial(self.screen, "P → Pause", WHITE, arial_font, controls_x_pos, controls_text_y + 45, align_right=False)
+        return panel_rect
 
     def run(self):
-        self.setup_new_game()
+        if self.pregenerate and not self.endless and not self.fixed_layout:
+            self.start_pool()
         self.start_game_flow = False
+        self.initial_screen()
+        prompt_visible = True
         while not self.start_game_flow and not self.exit_game:
-            self.initial_screen()
-            for event in pygame.event.get():
+            events = self.wait_for_events(INTRO_BLINK_MS)
+            if not events:
+                prompt_visible = not prompt_visible
+                self.draw_intro_prompt(prompt_visible)
+            for event in events:
                 if event.type == pygame.QUIT: self.exit_game = True
+                if event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE): self.initial_screen()
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE: self.exit_game = True
                     if event.key == pygame.K_s: self.start_game_flow = True
         
-        if self.exit_game: pygame.quit(); sys.exit(0)
+        if self.exit_game: self.quit()
 
-        if self.screen : self.screen.fill(BLACK) 
-        if self.maze: self.maze.dfs(self.screen)
+        self.start_round()
         self.render_game_elements()
 
         clock = pygame.time.Clock()
+        self.sim_clock.reset()
+        if self.profile_path:
+            PROFILER.enabled = PROFILER.recording = True
+        pending_events = [] # Input waits here for the next simulation tick
         while not self.exit_game:
-            events = pygame.event.get()
+            if self.idle():
+                # Nothing on screen can change until an event arrives, so sleep in SDL instead of redrawing it
+                events = self.wait_for_events()
+                clock.tick()
+                self.sim_clock.reset()
+                elapsed = 0.0
+            else:
+                elapsed = clock.tick(self.fps) / 1000.0
+                events = pygame.event.get()
+            PROFILER.start_frame()
+            stalled = False
             for event in events:
                 if event.type == pygame.QUIT: self.exit_game = True
+                if event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE): self.invalidate_display()
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE: self.exit_game = True
+                    if event.key == pygame.K_F3: self.toggle_profile()
+                    if event.key == pygame.K_p and not (self.game_over or self.winner or self.solved_by_system):
+                        self.paused = not self.paused
                     if event.key == pygame.K_r:
-                        self.setup_new_game()
-                        if self.screen: self.screen.fill(BLACK)
-                        if self.maze: self.maze.dfs(self.screen)
-                    if not self.game_over and not self.solved_by_system and not self.winner and event.key == pygame.K_q:
+                        self.start_round()
+                        stalled = True
+                    if not self.game_over and not self.solved_by_system and not self.winner and not self.endless and event.key == pygame.K_q:
                         if self.maze and self.player and self.screen: 
-                            self.screen.fill(BLACK) 
-                            self.maze.bfs(self.screen, self.player)
-                            self.solved_by_system = True
+                            self.solve()
+                            stalled = True
+            if stalled:
+                # Carving or the solver animation ran inside this frame; the simulation should not catch up on it
+                clock.tick()
+                self.sim_clock.reset()
+                pending_events = []
+                self.render_game_elements() # The loop may go idle next, so the solved maze has to be on screen now
+                continue
             
             if not self.exit_game:
-                self.update_game_state(events) 
+                pending_events.extend(events)
+                PROFILER.mark("events")
+                for _ in range(self.sim_clock.advance(elapsed)):
+                    self.update_game_state(pending_events)
+                    pending_events = []
+                if self.idle():
+                    pending_events = [] # Moves pressed while paused or after the round ended are not kept for later
+                PROFILER.mark("update")
+                # Idle frames stay up until the next event, so sprites are drawn where they ended, not mid-glide
+                self.render_game_elements(1.0 if self.idle() else self.sim_clock.alpha)
+                PROFILER.end_frame()
+        self.quit()
+
+    def idle(self):
+        # Paused or round over: the simulation does not advance
+        return self.paused or self.game_over or self.winner or self.solved_by_system
+
+    def wait_for_events(self, timeout=0):
+        # Blocks until at least one event arrives (or timeout ms pass, when given) and returns all that are queued
+        event = pygame.event.wait(timeout) if timeout else pygame.event.wait()
+        events = [] if event.type == pygame.NOEVENT else [event]
+        return events + pygame.event.get()
+
+    def solve(self):
+        if self.recorder: self.recorder.solve()
+        animate = self.solve_frames > 0
+        if animate: self.screen.fill(BLACK) 
+        path = self.maze.bfs(self.screen, self.player, self.camera, self.solve_frames, self.solver)
+        self.solved_by_system = True
+        if animate or not path:
+            self.invalidate_display() # The animation (or the error message) drew over the whole screen
+        else:
+            # Shown instantly: only the path's cells changed, so only they are repainted
+            for index in path:
+                self.renderer.mark_cell(index)
+            if self.minimap: self.minimap.invalidate()
+
+    def round_outcome(self):
+        if self.winner: return "won"
+        if self.game_over: return "caught"
+        if self.solved_by_system: return "solved"
+        return "abandoned"
+
+    def start_replay_round(self, replay_round):
+        # The round's maze comes from its recorded seed, exactly as the pool or the carving animation built it
+        layout = self.fixed_layout
+        if layout is None and not self.endless:
+            layout = build_layout(self.num_rows, self.num_cols, self.num_monsters, replay_round.layout_seed, self.algorithm,
+                                  self.use_swarm)
+        self.setup_new_game(layout, replay_round.round_seed)
+        self.invalidate_display()
+
+    def replay_tick(self, replay_round, tick):
+        # Runs recorded tick `tick` of the round; returns False once the round is over
+        if tick == replay_round.solve_tick and not self.solved_by_system:
+            self.solve()
+        if tick >= replay_round.ticks:
+            return False
+        self.update_game_state([pygame.event.Event(pygame.KEYDOWN, key=DIRECTION_KEYS[direction])
+                                for direction in replay_round.moves.get(tick, ())])
+        return True
+
+    def replay(self, replay, speed=1.0, headless=False):
+        # Plays a recording back: on screen at `speed` times real time, or headless as fast as the CPU allows.
+        # Prints each round's result next to the recorded one; returns how many rounds ended differently.
+        if headless:
+            self.solve_frames = 0
+        else:
+            self.sim_clock.speed = speed
+            self.sim_clock.max_ticks_per_frame = max(MAX_TICKS_PER_FRAME, int(speed * replay.tick_rate / self.fps) + 2)
+            if self.profile_path:
+                PROFILER.enabled = PROFILER.recording = True
+        clock = pygame.time.Clock()
+        mismatches = 0
+        total_ticks = 0
+        started = time.perf_counter()
+        for number, replay_round in enumerate(replay.rounds, 1):
+            if self.exit_game:
+                break
+            self.start_replay_round(replay_round)
+            tick = 0
+            if headless:
+                while self.replay_tick(replay_round, tick):
+                    tick += 1
+            else:
                 self.render_game_elements()
-            clock.tick(30)
+                clock.tick()
+                self.sim_clock.reset()
+                running = True
+                while running and not self.exit_game:
+                    elapsed = clock.tick(self.fps) / 1000.0
+                    PROFILER.start_frame()
+                    for event in pygame.event.get():
+                        if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                            self.exit_game = True
+                    PROFILER.mark("events")
+                    for _ in range(self.sim_clock.advance(elapsed)):
+                        running = self.replay_tick(replay_round, tick)
+                        if not running:
+                            break
+                        tick += 1
+                    PROFILER.mark("update")
+                    self.render_game_elements(self.sim_clock.alpha)
+                    PROFILER.end_frame()
+            total_ticks += tick
+            outcome = self.round_outcome()
+            if self.exit_game and tick < replay_round.ticks:
+                print(f"Round {number}: stopped after {tick:,} of {replay_round.ticks:,} ticks")
+            elif outcome == replay_round.outcome:
+                print(f"Round {number}: {outcome}, {tick:,} ticks, as recorded")
+            else:
+                mismatches += 1
+                print(f"Round {number}: {outcome}, {tick:,} ticks, but the recording says {replay_round.outcome}")
+        seconds = time.perf_counter() - started
+        print(f"{len(replay.rounds)} rounds, {total_ticks:,} ticks in {seconds:.2f}s ({total_ticks / max(seconds, 1e-9):,.0f} ticks/s)")
+        return mismatches
+
+    def quit(self, status=0):
+        if self.pool: self.pool.close()
+        if self.profile_path:
+            PROFILER.dump(self.profile_path)
+            print(f"Frame profile written to {self.profile_path}")
+        if self.recorder:
+            self.recorder.end_round(self.round_outcome())
+            self.recorder.save(self.record_path)
+            print(f"Input recording written to {self.record_path}")
         pygame.quit()
-        sys.exit(0)
+        sys.exit(status)
         
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Escape the maze while avoiding the monsters.")
+    parser.add_argument("--rows", type=int, default=None, help="maze height in cells (default: fits the window)")
+    parser.add_argument("--cols", type=int, default=None, help="maze width in cells (default: fits the window)")
+    parser.add_argument("--cell-size", type=int, default=SIZE, help="cell size in pixels (default: %(default)s)")
+    parser.add_argument("--solve-frames", type=int, default=SOLVE_FRAMES,
+                        help="frames the solver animation may take, 0 to show the path instantly (default: %(default)s)")
+    parser.add_argument("--algorithm", choices=sorted(GENERATORS), default=DEFAULT_GENERATOR,
+                        help="maze generation algorithm (default: %(default)s)")
+    parser.add_argument("--compare-generators", action="store_true",
+                        help="time every generation algorithm on the chosen maze size and exit")
+    parser.add_argument("--solver", choices=[GOAL_TREE_SOLVER] + list(SOLVERS), default=GOAL_TREE_SOLVER,
+                        help="algorithm behind Q (show solution) (default: %(default)s)")
+    parser.add_argument("--compare-solvers", action="store_true",
+                        help="run every solver on one maze of the chosen size and algorithm, print the cells each expanded and exit")
+    parser.add_argument("--bot", choices=list(BOTS), default=None,
+                        help="play --games headless games with this scripted player, print the win rate and time to catch and exit")
+    parser.add_argument("--games", type=int, default=BOT_GAMES, help="games for --bot (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processes for --bot, 0 to play in this process (default: one per CPU)")
+    parser.add_argument("--monster-delay", type=int, default=None,
+                        help="with --bot, ticks between every monster's moves instead of the usual 20-35")
+    parser.add_argument("--spawn-distance", type=int, default=MIN_DIST_MONSTER_FROM_PLAYER,
+                        help="with --bot, minimum maze steps from the start to a monster spawn (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed for the game session, --compare-generators, --compare-solvers, --bot and --save-maze (default: random)")
+    parser.add_argument("--monsters", type=int, default=2, help="number of monsters (default: %(default)s)")
+    parser.add_argument("--swarm", action="store_true",
+                        help="keep the monsters in NumPy arrays and move them in batches; for hundreds of monsters")
+    parser.add_argument("--pregenerate", type=int, default=POOL_SIZE,
+                        help="mazes generated in the background ahead of restarts, 0 to carve each one on demand (default: %(default)s)")
+    parser.add_argument("--fps", type=int, default=FPS,
+                        help="render frame rate; the game itself always runs at %d ticks per second (default: %%(default)s)" % TICK_RATE)
+    parser.add_argument("--profile", metavar="FILE", default=None,
+                        help="time every frame by phase and write the trace to FILE on exit (.json, otherwise CSV)")
+    parser.add_argument("--save-maze", metavar="FILE", default=None,
+                        help="generate a maze with the chosen size, algorithm and monsters, save it to FILE and exit")
+    parser.add_argument("--load-maze", metavar="FILE", default=None, help="play a maze saved with --save-maze")
+    parser.add_argument("--endless", action="store_true",
+                        help="endless mode: the maze keeps growing downwards as you go (uses --cols, ignores --rows)")
+    parser.add_argument("--record", metavar="FILE", default=None, help="record every round's seeds and your moves to FILE on exit")
+    parser.add_argument("--replay", metavar="FILE", default=None,
+                        help="play back a --record file (its maze settings replace --rows, --cols, --algorithm and the rest)")
+    parser.add_argument("--replay-speed", type=float, default=1.0, help="playback speed for --replay (default: %(default)s)")
+    parser.add_argument("--headless", action="store_true",
+                        help="with --replay, fast-forward without a window and exit with status 1 if any round ends differently")
+    args = parser.parse_args(argv)
+    if args.cell_size < 4:
+        parser.error("--cell-size must be at least 4 pixels")
+    if args.solve_frames < 0:
+        parser.error("--solve-frames cannot be negative")
+    if args.fps < 1:
+        parser.error("--fps must be at least 1")
+    if args.pregenerate < 0:
+        parser.error("--pregenerate cannot be negative")
+    if args.monsters < 0:
+        parser.error("--monsters cannot be negative")
+    if args.games < 1:
+        parser.error("--games must be at least 1")
+    if args.workers is not None and args.workers < 0:
+        parser.error("--workers cannot be negative")
+    if args.monster_delay is not None and args.monster_delay < 1:
+        parser.error("--monster-delay must be at least 1")
+    if args.load_maze and (args.endless or args.save_maze):
+        parser.error("--load-maze cannot be combined with --endless or --save-maze")
+    if args.replay and (args.record or args.endless or args.save_maze):
+        parser.error("--replay cannot be combined with --record, --endless or --save-maze")
+    if args.headless and not args.replay:
+        parser.error("--headless needs --replay")
+    if args.replay_speed <= 0:
+        parser.error("--replay-speed must be positive")
+    if args.swarm and np is None:
+        parser.error("--swarm needs NumPy: pip install numpy")
+    for name in ("rows", "cols"):
+        value = getattr(args, name)
+        if value is not None and value < 2:
+            parser.error(f"--{name} must be at least 2")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.compare_generators:
+        compare_generators(args.rows or HEIGHT // args.cell_size, args.cols or WIDTH // args.cell_size, args.seed)
+        return
+    if args.compare_solvers:
+        compare_solvers(args.rows or HEIGHT // args.cell_size, args.cols or WIDTH // args.cell_size, args.seed, args.algorithm)
+        return
+    if args.bot:
+        report_bots(args.bot, args.games, args.rows or HEIGHT // args.cell_size, args.cols or WIDTH // args.cell_size,
+                    args.monsters, args.algorithm, args.seed, args.workers,
+                    monster_delay=args.monster_delay, min_distance=args.spawn_distance)
+        return
+    if args.save_maze:
+        layout = build_layout(args.rows or HEIGHT // args.cell_size, args.cols or WIDTH // args.cell_size, args.monsters,
+                              args.seed, args.algorithm, args.swarm)
+        save_layout(layout, args.save_maze)
+        print(f"Saved a {layout.num_rows}x{layout.num_cols} {layout.algorithm} maze to {args.save_maze}")
+        return
+    layout = None
+    if args.load_maze:
+        try:
+            layout = load_layout(args.load_maze)
+        except (OSError, ValueError) as e:
+            print(f'Error loading maze: {e}')
+            sys.exit(1)
     if not os.path.exists("assets"):
         os.makedirs("assets")
         print("Created 'assets' folder. Please place 'player.png', 'monster_1.png', 'monster_2.png', 'start.png', and 'finish.png' in it.")
@@ -764,11 +3153,35 @@ def main():
 
     if not os.path.exists("fonts"):
         print("Warning: 'fonts' folder not found. Game will use system default font if Orbitron is not available.")
-    elif not os.path.exists(os.path.join("fonts", "Orbitron-VariableFont_wght.ttf")):
+    elif not os.path.exists(FONT_PATH):
         print("Warning: Font file 'Orbitron-VariableFont_wght.ttf' not found in 'fonts' folder.")
 
-    mygame = Game()
+    if args.replay:
+        try:
+            replay = load_replay(args.replay)
+        except (OSError, ValueError) as e:
+            print(f'Error loading recording: {e}')
+            sys.exit(1)
+        if replay.fixed_layout and layout is None:
+            print(f'Error: {args.replay} was recorded on a saved maze; pass the same file with --load-maze')
+            sys.exit(1)
+        if replay.swarm and np is None:
+            print(f'Error: {args.replay} was recorded in swarm mode, which needs NumPy: pip install numpy')
+            sys.exit(1)
+        if args.headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+        mygame = Game(num_rows=replay.num_rows, num_cols=replay.num_cols, cell_size=replay.cell_size, solve_frames=args.solve_frames,
+                      algorithm=replay.algorithm, endless=replay.endless, num_monsters=replay.num_monsters, swarm=replay.swarm,
+                      pregenerate=0, fps=args.fps, tick_rate=replay.tick_rate, profile_path=args.profile, layout=layout,
+                      solver=args.solver)
+        mismatches = mygame.replay(replay, args.replay_speed, args.headless)
+        mygame.quit(1 if mismatches and args.headless else 0)
+
+    mygame = Game(num_rows=args.rows, num_cols=args.cols, cell_size=args.cell_size, solve_frames=args.solve_frames,
+                  algorithm=args.algorithm, endless=args.endless,
+                  num_monsters=args.monsters, swarm=args.swarm, pregenerate=args.pregenerate, fps=args.fps,
+                  profile_path=args.profile, layout=layout, solver=args.solver, seed=args.seed, record_path=args.record)
     mygame.run()
 
-if _name_ == '_main_': 
+if __name__ == '__main__':
     main()
\ No newline at end of file
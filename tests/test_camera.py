@@ -0,0 +1,28 @@
+import pygame
+
+import maze
+
+
+def test_followed_player_stays_put_between_ticks():
+    # Mid-maze the view scrolls with the player, so at every alpha the player is drawn at the same screen spot
+    game = maze.Game(num_rows=60, num_cols=60, pregenerate=0, solve_frames=0, num_monsters=0)
+    layout = maze.build_layout(60, 60, num_monsters=0, seed=2)
+    row = 30
+    col = next(col for col in range(20, 40) if not layout.walls[row * 60 + col] & maze.WALL_RIGHT)
+    layout.start = (row, col)
+    game.setup_new_game(layout, round_seed=1)
+    game.update_game_state([pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RIGHT)])
+    camera = game.camera
+    assert camera.target_x - camera.previous_x == game.cell_size
+    positions = set()
+    for alpha in (0.0, 0.25, 0.5, 0.75, 1.0):
+        camera.interpolate(alpha)
+        positions.add(game.player.draw_pos(camera, alpha))
+    assert len(positions) == 1
+
+
+def test_follow_still_moves_the_view_at_once():
+    camera = maze.Camera(200, 200, 100, 100, 10)
+    assert camera.follow(50, 50)
+    assert (camera.offset_x, camera.offset_y) == (405, 405)
+    assert not camera.follow(50, 50)
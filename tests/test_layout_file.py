@@ -0,0 +1,82 @@
+import pytest
+
+import maze
+
+
+def saved(tmp_path, layout, name="maze.bin"):
+    path = tmp_path / name
+    maze.save_layout(layout, path)
+    return path
+
+
+@pytest.mark.parametrize("num_rows, num_cols", [(12, 17), (7, 9), (5, 3)])
+def test_round_trip(tmp_path, num_rows, num_cols):
+    # 7x9 and 5x3 have an odd cell count, so the last packed byte holds a single cell
+    layout = maze.build_layout(num_rows, num_cols, num_monsters=3, seed=1234, algorithm="prim")
+    loaded = maze.load_layout(saved(tmp_path, layout))
+    assert (loaded.num_rows, loaded.num_cols) == (num_rows, num_cols)
+    assert loaded.walls == layout.walls
+    assert loaded.start == layout.start
+    assert loaded.finish == layout.finish
+    assert loaded.monsters == [tuple(spawn) for spawn in layout.monsters]
+    assert loaded.seed == 1234
+    assert loaded.algorithm == "prim"
+
+
+def test_truncated_file(tmp_path):
+    path = saved(tmp_path, maze.build_layout(7, 9, seed=5))
+    data = path.read_bytes()
+    for length in (len(data) - 1, maze.MAZE_FILE_HEADER.size, 3):
+        path.write_bytes(data[:length])
+        with pytest.raises(ValueError):
+            maze.load_layout(path)
+
+
+def test_trailing_data(tmp_path):
+    path = saved(tmp_path, maze.build_layout(7, 9, seed=5))
+    path.write_bytes(path.read_bytes() + b"\0")
+    with pytest.raises(ValueError, match="trailing"):
+        maze.load_layout(path)
+
+
+def test_monster_spawn_outside_the_maze(tmp_path):
+    layout = maze.build_layout(7, 9, num_monsters=2, seed=5)
+    layout.monsters[1] = (7, 0, layout.monsters[1][2])
+    with pytest.raises(ValueError, match="spawn"):
+        maze.load_layout(saved(tmp_path, layout))
+    layout.monsters[1] = (0, 9, layout.monsters[1][2])
+    with pytest.raises(ValueError, match="spawn"):
+        maze.load_layout(saved(tmp_path, layout))
+
+
+def test_unknown_algorithm(tmp_path):
+    layout = maze.build_layout(7, 9, seed=5)
+    layout.algorithm = "bogus"
+    with pytest.raises(ValueError, match="bogus"):
+        maze.load_layout(saved(tmp_path, layout))
+
+
+def test_goal_outside_the_maze(tmp_path):
+    layout = maze.build_layout(7, 9, seed=5)
+    layout.finish = (0, 9)
+    with pytest.raises(ValueError, match="goal"):
+        maze.load_layout(saved(tmp_path, layout))
+
+
+def test_not_a_maze_file(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"hello, world" * 10)
+    with pytest.raises(ValueError, match="not a maze file"):
+        maze.load_layout(path)
+
+
+def test_open_border(tmp_path):
+    layout = maze.build_layout(5, 5, seed=5)
+    layout.walls = maze.array('B', bytes(25))
+    with pytest.raises(ValueError, match="outer walls"):
+        maze.load_layout(saved(tmp_path, layout))
+    for index, wall in ((2, maze.WALL_TOP), (22, maze.WALL_BOTTOM), (10, maze.WALL_LEFT), (14, maze.WALL_RIGHT)):
+        layout = maze.build_layout(5, 5, seed=5)
+        layout.walls[index] &= ~wall
+        with pytest.raises(ValueError, match="outer walls"):
+            maze.load_layout(saved(tmp_path, layout))
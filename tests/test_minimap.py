@@ -0,0 +1,19 @@
+import pygame
+import pytest
+
+import maze
+
+np = pytest.importorskip("numpy")
+
+
+def test_solution_stays_on_the_minimap():
+    game = maze.Game(num_rows=60, num_cols=60, pregenerate=0, solve_frames=0, seed=3)
+    game.start_round()
+    game.render_game_elements()
+    before = game.minimap._picture()
+    game.solve()
+    game.render_game_elements()
+    assert (game.minimap._picture() != before).any() # The solution cells are ORANGE, the path YELLOW
+    # Drawn over the panel rather than covered by the solved message
+    area = pygame.surfarray.array3d(game.screen.subsurface(game.minimap.rect))
+    assert (area != np.array(maze.BLACK, dtype=np.uint8)).any(axis=2).mean() > 0.5
@@ -0,0 +1,76 @@
+import random
+
+import pygame
+import pytest
+
+import maze
+
+
+def play_session(path, rounds=3, ticks=600, **options):
+    # Plays rounds of random key presses on a seeded game and saves the recording; returns each round's ending
+    game = maze.Game(num_rows=16, num_cols=16, seed=11, record_path=path, pregenerate=0, solve_frames=0, **options)
+    keys = random.Random(3)
+    endings = []
+    for number in range(rounds):
+        game.start_round()
+        for tick in range(ticks):
+            events = [pygame.event.Event(pygame.KEYDOWN, key=keys.choice(list(maze.KEY_DIRECTIONS)))
+                      if keys.random() < 0.3 else None]
+            if number == 1 and tick == 40 and not game.endless: # Q does nothing in endless mode
+                game.solve()
+            game.update_game_state([event for event in events if event])
+        endings.append((game.round_outcome(), game.player.matrix_pos_x_row, game.player.matrix_pos_y_col))
+    game.recorder.end_round(game.round_outcome())
+    game.recorder.save(path)
+    return endings
+
+
+def replay_game(replay):
+    return maze.Game(num_rows=replay.num_rows, num_cols=replay.num_cols, cell_size=replay.cell_size,
+                     algorithm=replay.algorithm, endless=replay.endless, num_monsters=replay.num_monsters,
+                     swarm=replay.swarm, pregenerate=0, tick_rate=replay.tick_rate)
+
+
+@pytest.mark.parametrize("options", [{}, {"endless": True}, {"swarm": True, "num_monsters": 30}])
+def test_headless_replay_matches_the_recording(tmp_path, options):
+    if options.get("swarm") and maze.np is None:
+        pytest.skip("swarm mode needs NumPy")
+    path = tmp_path / "session.mzr"
+    endings = play_session(path, **options)
+    replay = maze.load_replay(path)
+    assert len(replay.rounds) == len(endings)
+    game = replay_game(replay)
+    assert game.replay(replay, headless=True) == 0
+    outcome, row, col = endings[-1]
+    assert (game.round_outcome(), game.player.matrix_pos_x_row, game.player.matrix_pos_y_col) == (outcome, row, col)
+
+
+def test_large_swarm_monster_count(tmp_path):
+    # More monsters than a 16-bit field holds
+    path = tmp_path / "swarm.mzr"
+    recorder = maze.InputRecorder(400, 400, 100_000, maze.DEFAULT_GENERATOR, flags=maze.REPLAY_SWARM)
+    recorder.start_round(5, 6)
+    recorder.tick([maze.WALL_RIGHT])
+    recorder.end_round("caught")
+    recorder.save(path)
+    replay = maze.load_replay(path)
+    assert replay.num_monsters == 100_000
+    assert replay.swarm
+    assert [(round_.layout_seed, round_.round_seed, round_.outcome) for round_ in replay.rounds] == [(5, 6, "caught")]
+
+
+def test_truncated_recording(tmp_path):
+    path = tmp_path / "session.mzr"
+    play_session(path, rounds=1, ticks=100)
+    data = path.read_bytes()
+    path.write_bytes(data[:maze.REPLAY_FILE_HEADER.size - 1])
+    with pytest.raises(ValueError):
+        maze.load_replay(path)
+
+
+def test_catch_up_limit_follows_the_recorded_tick_rate():
+    # 20x speed of a 120 ticks/s recording at 60 FPS needs 40 ticks a frame, not the 10 TICK_RATE would give
+    replay = maze.Replay(16, 16, 2, maze.DEFAULT_GENERATOR, maze.SIZE, 120, 0)
+    game = replay_game(replay)
+    game.replay(replay, speed=20)
+    assert game.sim_clock.max_ticks_per_frame == int(20 * 120 / game.fps) + 2
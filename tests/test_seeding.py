@@ -0,0 +1,46 @@
+import time
+
+import maze
+
+
+def layouts(game, rounds, wait=False):
+    played = []
+    for _ in range(rounds):
+        if wait and game.pool:
+            while not all(result.ready() for _, result in game.pool.pending):
+                time.sleep(0.01)
+        game.start_round()
+        played.append((bytes(game.maze.walls), game.player.matrix_pos_x_row, game.player.matrix_pos_y_col,
+                       [(monster.matrix_pos_x_row, monster.matrix_pos_y_col) for monster in game.monsters], game.round_seed))
+    if game.pool:
+        game.pool.close()
+    return played
+
+
+def session(pregenerate, wait=False, processes=False, rounds=4):
+    game = maze.Game(num_rows=12, num_cols=14, seed=7, pregenerate=pregenerate, solve_frames=0)
+    if pregenerate:
+        game.start_pool(processes)
+    return layouts(game, rounds, wait)
+
+
+def test_seeded_sessions_repeat_whatever_the_pool_timing():
+    carved = session(0)
+    assert session(2, wait=True) == carved # every round from the pool
+    assert session(2, wait=False, processes=True) == carved # the first rounds carved while the workers start
+    assert len({walls for walls, *_ in carved}) == len(carved)
+
+
+def test_pool_take_skips_and_drops_seeds():
+    pool = maze.MazePool(6, 6, size=3, processes=False)
+    pool.request([1, 2, 3])
+    pool.request([2, 3, 4]) # already queued seeds are not built twice
+    assert [seed for seed, _ in pool.pending] == [1, 2, 3, 4]
+    for _, result in pool.pending:
+        result.wait()
+    layout = pool.take(3)
+    assert layout.seed == 3
+    assert layout.walls == maze.build_layout(6, 6, seed=3).walls
+    assert [seed for seed, _ in pool.pending] == [4]
+    assert pool.take(9) is None and not pool.pending
+    pool.close()
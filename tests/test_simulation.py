@@ -0,0 +1,34 @@
+import random
+
+import pygame
+
+import maze
+
+
+def test_game_follows_the_simulation_rules():
+    # A Game round and a bare Simulation on the same layout and seed stay in step, move for move
+    layout = maze.build_layout(20, 20, num_monsters=4, seed=8)
+    game = maze.Game(num_rows=20, num_cols=20, pregenerate=0, solve_frames=0)
+    game.setup_new_game(layout, round_seed=99)
+    simulation = maze.Simulation(layout, random.Random(99))
+    moves = random.Random(1)
+    for _ in range(5000):
+        direction = moves.choice(maze.CLOCKWISE)
+        game.update_game_state([pygame.event.Event(pygame.KEYDOWN, key=maze.DIRECTION_KEYS[direction])])
+        outcome = simulation.step(direction)
+        assert (game.player.matrix_pos_x_row, game.player.matrix_pos_y_col) == divmod(simulation.player, 20)
+        assert [(monster.matrix_pos_x_row, monster.matrix_pos_y_col) for monster in game.monsters] == \
+            [divmod(index, 20) for index in simulation.monsters]
+        if outcome:
+            break
+    assert outcome == ("won" if game.winner else "caught" if game.game_over else None)
+
+
+def test_solver_bot_wins_without_monsters():
+    for seed in range(5):
+        assert maze.play_bot_game(seed, "solver", 15, 15, num_monsters=0)[0] == "won"
+
+
+def test_bot_games_repeat_from_their_seed():
+    for bot in maze.BOTS:
+        assert maze.play_bot_game(3, bot, 15, 15, max_ticks=20000) == maze.play_bot_game(3, bot, 15, 15, max_ticks=20000)
@@ -0,0 +1,37 @@
+import random
+
+import pygame
+import pytest
+
+import maze
+
+np = pytest.importorskip("numpy")
+
+
+def test_tree_depths_match_the_distance_to_the_goal():
+    layout = maze.build_layout(30, 40, seed=4)
+    goal = layout.finish[0] * 40 + layout.finish[1]
+    depth = maze.tree_depths(np.frombuffer(layout.goal_parent, dtype=np.int32).astype(np.int64))
+    assert depth.tolist() == list(maze.distance_field(layout.walls, 30, 40, goal))
+
+
+@pytest.mark.parametrize("algorithm", sorted(maze.GENERATORS))
+def test_tree_chase_moves_the_swarm_like_the_distance_field(algorithm):
+    # The same seeded round twice, once steered by the goal tree and once by a BFS field every player move
+    runs = []
+    for use_tree in (True, False):
+        game = maze.Game(num_rows=25, num_cols=25, num_monsters=20, swarm=True, pregenerate=0, solve_frames=0,
+                         algorithm=algorithm, seed=9)
+        game.setup_new_game()
+        if not use_tree:
+            game.tree_chase = None
+        keys = random.Random(2)
+        positions = []
+        for _ in range(1500):
+            game.update_game_state([pygame.event.Event(pygame.KEYDOWN, key=keys.choice(list(maze.KEY_DIRECTIONS)))
+                                    for _ in range(keys.choice((0, 0, 1, 2)))])
+            positions.append(game.swarm.positions.tolist())
+            if game.game_over or game.winner:
+                break
+        runs.append((positions, game.game_over, game.winner))
+    assert runs[0] == runs[1]